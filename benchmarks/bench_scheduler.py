@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark schedule_meetings' solver as meetings and attendees grow.
+
+Generates a working week in which every attendee already has a random share
+of their time booked, then asks the solver to place batches of meetings with
+random panels, optional attendees, buffers, priorities and day windows.
+Free/busy comes from memory, so the times are the local solve alone.
+
+With the defaults (40% busy, 2 s limit), the best total priority is proven
+within a few milliseconds for batches of up to 20 meetings. From 40 meetings
+on, the proof often does not finish. For example, it completed in 2 of 5
+instances at 40 meetings and 10 attendees, and in none at 60 and 10. The
+plan returned is then the best found in the time limit, not a proven
+optimum. Proving optional attendance optimal as well takes up to a second
+at 20 meetings and usually hits the limit beyond that.
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --meetings 10 40 80 --attendees 50 --busy 0.6
+"""
+
+import argparse
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calendar_assistant.utils.scheduler import MeetingRequest, MeetingSolver  # noqa: E402
+
+HOUR = 3600
+DAY = 24 * HOUR
+# Monday 2026-01-05 00:00 UTC
+WEEK_START = 1767571200
+
+
+def work_day(day: int):
+    return WEEK_START + day * DAY + 9 * HOUR, WEEK_START + day * DAY + 17 * HOUR
+
+
+def make_busy(rng: random.Random, people, busy_share: float):
+    """Random half-hour to two-hour bookings filling about ``busy_share`` of each day."""
+    busy = {}
+    for person in people:
+        periods = []
+        for day in range(5):
+            opens, closes = work_day(day)
+            booked = 0
+            while booked < busy_share * (closes - opens):
+                length = rng.choice((1800, 1800, 3600, 5400, 7200))
+                start = opens + rng.randrange(0, (closes - opens) // 1800) * 1800
+                periods.append((start, start + length))
+                booked += length
+        busy[person] = periods
+    return busy
+
+
+def make_meetings(rng: random.Random, people, count: int):
+    meetings = []
+    for i in range(count):
+        panel = rng.sample(people, rng.randint(2, 4))
+        observers = rng.sample([p for p in people if p not in panel], rng.randint(0, 2))
+        if rng.random() < 0.5:
+            first = rng.randrange(5)
+            days = range(first, min(5, first + rng.randint(1, 2)))
+        else:
+            days = range(5)
+        meetings.append(MeetingRequest(
+            f'Meeting {i}',
+            rng.choice((30, 45, 60, 90)) * 60,
+            required=panel,
+            optional=observers,
+            windows=[work_day(day) for day in days],
+            buffer=rng.choice((0, 0, 15)) * 60,
+            priority=rng.choice((1, 1, 1, 2, 3))
+        ))
+    return meetings
+
+
+def run(meetings: int, attendees: int, busy_share: float, trials: int, time_limit: float):
+    times, priority_times, placed, priority_optimal, complete = [], [], [], 0, 0
+    for trial in range(trials):
+        rng = random.Random(f'{meetings}-{attendees}-{trial}')
+        people = [f'person{i}@example.com' for i in range(attendees)]
+        busy = make_busy(rng, people, busy_share)
+        requests = make_meetings(rng, people, meetings)
+
+        solver = MeetingSolver(WEEK_START, WEEK_START + 5 * DAY, busy, max_buffer=900)
+        plan = solver.solve(requests, time_limit=time_limit)
+
+        stats = plan['stats']
+        times.append(stats['seconds'] * 1000)
+        if stats['priority_optimal']:
+            priority_optimal += 1
+            priority_times.append(stats['priority_seconds'] * 1000)
+        placed.append(len(plan['scheduled']))
+        complete += stats['complete']
+
+    priority_time = f'{statistics.mean(priority_times):8.2f}' if priority_times else '       -'
+    print(
+        f'{meetings:>8} {attendees:>9}  {statistics.mean(placed):6.1f}  '
+        f'{priority_time} ms {priority_optimal:>3}/{trials:<3}  '
+        f'{statistics.mean(times):8.2f} ms {complete:>3}/{trials:<3}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--meetings', type=int, nargs='+', default=[5, 10, 20, 40, 60],
+                        help='Batch sizes to solve')
+    parser.add_argument('--attendees', type=int, nargs='+', default=[10, 25, 50],
+                        help='Attendee pool sizes to draw panels from')
+    parser.add_argument('--busy', type=float, default=0.4,
+                        help='Share of working time already booked per attendee')
+    parser.add_argument('--trials', type=int, default=5,
+                        help='Random instances per configuration')
+    parser.add_argument('--time-limit', type=float, default=2.0,
+                        help='Solver time limit in seconds')
+    args = parser.parse_args()
+
+    print(f'{args.busy:.0%} of each working week already busy, '
+          f'{args.trials} instance(s) each, {args.time_limit}s limit\n')
+    # Placement: total priority proven best. Full: optional attendance too.
+    print(f'{"meetings":>8} {"attendees":>9}  {"placed":>6}  '
+          f'{"placement solved":>19}  {"full solve (limit)":>19}')
+    for attendees in args.attendees:
+        for meetings in args.meetings:
+            run(meetings, attendees, args.busy, args.trials, args.time_limit)
+
+
+if __name__ == '__main__':
+    main()
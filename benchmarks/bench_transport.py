@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark per-call latency with and without connection reuse.
+
+Runs a sustained request load against a local keep-alive server that adds a
+fixed delay to every response (network round trip plus server time) and a
+further delay to every new connection (TCP + TLS setup to googleapis.com),
+or against a real URL with --url.
+
+Each mode runs once per --threads value, 1 and 4 by default. With a single
+caller, a shared keep-alive httplib2 connection already avoids repeated
+handshakes. PooledHttp is then no faster and costs a little per call.
+The pool pays off only with concurrent callers, which would otherwise
+queue behind the one shared connection.
+
+    python benchmarks/bench_transport.py
+    python benchmarks/bench_transport.py --threads 1 8 --handshake-ms 50
+    python benchmarks/bench_transport.py --url https://www.googleapis.com/discovery/v1/apis
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httplib2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calendar_assistant.utils.transport import PooledHttp  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    latency_seconds = 0.0
+    body = b'{"kind": "calendar#events", "items": []}'
+
+    def setup(self):
+        # Paid once per connection, like a TCP + TLS handshake
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def do_GET(self):
+        time.sleep(self.latency_seconds)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(handshake_ms: float, latency_ms: float) -> ThreadingHTTPServer:
+    _Handler.handshake_seconds = handshake_ms / 1000
+    _Handler.latency_seconds = latency_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(name: str, call, url: str, requests: int, threads: int):
+    latencies = []
+
+    def timed(_):
+        start = time.perf_counter()
+        response, _ = call(url)
+        latencies.append(time.perf_counter() - start)
+        assert int(response.status) == 200, response.status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{name:<28} mean {statistics.mean(latencies) * 1000:7.2f} ms  "
+        f"p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.2f} ms  "
+        f"{requests / elapsed:8.1f} req/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Benchmark against this URL instead of a local server')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4],
+                        help='Concurrent callers; each mode runs once per value')
+    parser.add_argument('--handshake-ms', type=float, default=60.0,
+                        help='Local server delay per new connection')
+    parser.add_argument('--latency-ms', type=float, default=20.0,
+                        help='Local server delay per request')
+    parser.add_argument('--http2', action='store_true', help='Also try the HTTP/2 transport')
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        server = start_server(args.handshake_ms, args.latency_ms)
+        url = f'http://127.0.0.1:{server.server_address[1]}/calendar/v3/events'
+    for threads in args.threads:
+        print(f"\n{args.requests} GET {url} with {threads} thread(s)\n")
+
+        # No reuse: a fresh connection for every call
+        run('new connection per call', lambda u: httplib2.Http().request(u), url,
+            args.requests, threads)
+
+        # One shared httplib2 connection; not thread-safe, so calls are serialized
+        shared = httplib2.Http()
+        lock = threading.Lock()
+
+        def locked(u):
+            with lock:
+                return shared.request(u)
+
+        run('shared httplib2 (locked)', locked, url, args.requests, threads)
+
+        pooled = PooledHttp(pool_size=threads)
+        run('PooledHttp', pooled.request, url, args.requests, threads)
+        pooled.close()
+
+        if args.http2:
+            pooled = PooledHttp(pool_size=threads, http2=True)
+            run('PooledHttp (HTTP/2)', pooled.request, url, args.requests, threads)
+            pooled.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,16 +3,25 @@
 This server exposes Google Calendar functionality through the Model Context Protocol.
 """
 
+import asyncio
 import json
-from datetime import datetime, timedelta
+import os
+import sys
+from datetime import datetime, timedelta, timezone
 from typing import Any, Sequence
 from pathlib import Path
 
+from googleapiclient.errors import HttpError
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
 import mcp.server.stdio
 
+from ..utils.analytics import CalendarAnalytics
+from ..utils.conflicts import ConflictCheckError, SchedulingConflictError
 from ..utils.google_calendar import GoogleCalendarClient
+from ..utils.prefetch import Prefetcher
+from ..utils.timezones import day_bounds, event_span, format_local, to_epoch
+from ..utils.transport import PooledHttp
 
 
 # Initialize server
@@ -22,14 +31,77 @@ app = Server("google-calendar-assistant")
 calendar_client = None
 
 
+def pooled_transport(credentials):
+    """PooledHttp configured from the environment."""
+    return PooledHttp(
+        credentials,
+        pool_size=int(os.environ.get('HTTP_POOL_SIZE', 10)),
+        max_hosts=int(os.environ.get('HTTP_POOL_MAX_HOSTS', 4)),
+        timeout=float(os.environ.get('HTTP_TIMEOUT', 30)),
+        http2=os.environ.get('HTTP2', '0') == '1'
+    )
+
+
 def get_calendar_client():
     """Lazy initialization of calendar client."""
     global calendar_client
     if calendar_client is None:
-        calendar_client = GoogleCalendarClient()
+        # Tool calls run one at a time (see client_lock), where a single
+        # keep-alive httplib2 connection is faster than a pool
+        pooled = os.environ.get('HTTP_POOL', '0') == '1' or os.environ.get('HTTP2', '0') == '1'
+        calendar_client = GoogleCalendarClient(
+            timezone=os.environ.get('CALENDAR_TIMEZONE'),
+            transport=pooled_transport if pooled else None
+        )
+        calendar_client.event_cache.ttl = int(os.environ.get('EVENT_CACHE_TTL', 300))
     return calendar_client
 
 
+# Serializes use of the calendar client between tool calls and the prefetcher
+client_lock = asyncio.Lock()
+
+# Background prefetcher, started from main()
+prefetcher = None
+
+# Seconds between attempts to start prefetching while the client is unavailable
+PREFETCH_RETRY_SECONDS = 300
+
+
+async def run_prefetcher():
+    """Warm common event windows in the background until cancelled.
+
+    The client is created here rather than at startup, so a missing or
+    revoked token, or no network, never keeps the server from starting;
+    prefetching is simply retried later.
+    """
+    global prefetcher
+    while prefetcher is None:
+        try:
+            async with client_lock:
+                client = await asyncio.to_thread(get_calendar_client)
+                prefetcher = await asyncio.to_thread(
+                    Prefetcher,
+                    client,
+                    budget_per_hour=int(os.environ.get('PREFETCH_BUDGET_PER_HOUR', 60))
+                )
+        except Exception as error:
+            print(f"Prefetch not started, retrying later: {error}", file=sys.stderr)
+            await asyncio.sleep(PREFETCH_RETRY_SECONDS)
+    await prefetcher.run(client_lock)
+
+
+# Initialize analytics (shares the calendar client)
+calendar_analytics = None
+
+
+def get_calendar_analytics():
+    """Lazy initialization of calendar analytics."""
+    global calendar_analytics
+    if calendar_analytics is None:
+        calendar_analytics = CalendarAnalytics(get_calendar_client())
+    return calendar_analytics
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Google Calendar tools."""
@@ -73,11 +145,11 @@ async def list_tools() -> list[Tool]:
                     },
                     "start_time": {
                         "type": "string",
-                        "description": "Start time in ISO format (e.g., 2024-01-15T10:00:00)"
+                        "description": "Start time in ISO format (e.g., 2024-01-15T10:00:00); times without an offset are in the calendar's timezone"
                     },
                     "end_time": {
                         "type": "string",
-                        "description": "End time in ISO format (e.g., 2024-01-15T11:00:00)"
+                        "description": "End time in ISO format (e.g., 2024-01-15T11:00:00); times without an offset are in the calendar's timezone"
                     },
                     "description": {
                         "type": "string",
@@ -93,6 +165,12 @@ async def list_tools() -> list[Tool]:
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "List of attendee emails (optional)"
+                    },
+                    "conflict_policy": {
+                        "type": "string",
+                        "enum": ["allow", "warn", "reject"],
+                        "description": "What to do if the slot overlaps busy time (default: warn)",
+                        "default": "warn"
                     }
                 },
                 "required": ["summary", "start_time", "end_time"]
@@ -156,6 +234,12 @@ async def list_tools() -> list[Tool]:
                     "description": {
                         "type": "string",
                         "description": "New description (optional)"
+                    },
+                    "conflict_policy": {
+                        "type": "string",
+                        "enum": ["allow", "warn", "reject"],
+                        "description": "What to do if the slot overlaps busy time (default: warn)",
+                        "default": "warn"
                     }
                 },
                 "required": ["event_id"]
@@ -178,15 +262,247 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["start_time", "end_time"]
             }
+        ),
+        Tool(
+            name="validate_schedule",
+            description="Check a batch of proposed events for conflicts with each other and the calendar in one pass",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "events": {
+                        "type": "array",
+                        "description": "Proposed events to check",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "summary": {
+                                    "type": "string",
+                                    "description": "Event title (optional)"
+                                },
+                                "start_time": {
+                                    "type": "string",
+                                    "description": "Start time in ISO format"
+                                },
+                                "end_time": {
+                                    "type": "string",
+                                    "description": "End time in ISO format"
+                                }
+                            },
+                            "required": ["start_time", "end_time"]
+                        }
+                    }
+                },
+                "required": ["events"]
+            }
+        ),
+        Tool(
+            name="schedule_meetings",
+            description="Find conflict-free times for a batch of meetings (e.g. a round of interviews) using everyone's free/busy, and optionally book them",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "meetings": {
+                        "type": "array",
+                        "description": "Meetings to schedule",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "summary": {
+                                    "type": "string",
+                                    "description": "Meeting title"
+                                },
+                                "duration_minutes": {
+                                    "type": "integer",
+                                    "description": "Meeting length in minutes"
+                                },
+                                "required_attendees": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Emails of attendees who must be free"
+                                },
+                                "optional_attendees": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Emails of attendees to include when free (optional)"
+                                },
+                                "windows": {
+                                    "type": "array",
+                                    "description": "Time ranges the meeting must fall in (default: working hours)",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "start": {
+                                                "type": "string",
+                                                "description": "Range start in ISO format"
+                                            },
+                                            "end": {
+                                                "type": "string",
+                                                "description": "Range end in ISO format"
+                                            }
+                                        },
+                                        "required": ["start", "end"]
+                                    }
+                                },
+                                "buffer_minutes": {
+                                    "type": "integer",
+                                    "description": "Free time attendees need before and after; back-to-back meetings need the larger of their buffers between them (default: 0)",
+                                    "default": 0
+                                },
+                                "priority": {
+                                    "type": "integer",
+                                    "description": "Higher priorities are placed first when not everything fits (default: 1)",
+                                    "default": 1
+                                },
+                                "description": {
+                                    "type": "string",
+                                    "description": "Event description (optional)"
+                                },
+                                "location": {
+                                    "type": "string",
+                                    "description": "Event location (optional)"
+                                }
+                            },
+                            "required": ["summary", "duration_minutes"]
+                        }
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Earliest start in ISO format (default: now)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "Latest end in ISO format (default: 7 days after start_date)"
+                    },
+                    "work_start_hour": {
+                        "type": "integer",
+                        "description": "Local hour working time starts (default: 9)",
+                        "default": 9
+                    },
+                    "work_end_hour": {
+                        "type": "integer",
+                        "description": "Local hour working time ends (default: 17)",
+                        "default": 17
+                    },
+                    "include_weekends": {
+                        "type": "boolean",
+                        "description": "Allow meetings on weekends (default: false)",
+                        "default": False
+                    },
+                    "time_limit_seconds": {
+                        "type": "number",
+                        "description": "Maximum time spent searching for a plan (default: 2)",
+                        "default": 2
+                    },
+                    "book": {
+                        "type": "boolean",
+                        "description": "Create the planned events and send invitations (default: false)",
+                        "default": False
+                    }
+                },
+                "required": ["meetings"]
+            }
+        ),
+        Tool(
+            name="calendar_stats",
+            description="Summarize meeting time over a period, e.g. hours of meetings per week, per attendee or for a keyword",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "Start of the period in ISO format (default: days_back days ago)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "End of the period in ISO format (default: now)"
+                    },
+                    "days_back": {
+                        "type": "integer",
+                        "description": "Days to look back when start_date is not given (default: 90)",
+                        "default": 90
+                    },
+                    "group_by": {
+                        "type": "string",
+                        "enum": ["none", "day", "week", "month", "attendee", "calendar"],
+                        "description": "How to break down the totals (default: week)",
+                        "default": "week"
+                    },
+                    "keyword": {
+                        "type": "string",
+                        "description": "Only count events whose title contains this (optional)"
+                    },
+                    "attendee": {
+                        "type": "string",
+                        "description": "Only count events with a matching attendee email (optional)"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Maximum attendees/calendars listed (default: 10)",
+                        "default": 10
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="import_ics",
+            description="Import all events from an .ics file into the calendar",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the .ics file"
+                    },
+                    "timezone": {
+                        "type": "string",
+                        "description": "Timezone for times without one (default: the calendar's timezone)"
+                    }
+                },
+                "required": ["path"]
+            }
+        ),
+        Tool(
+            name="export_ics",
+            description="Export calendar events in a date range to an .ics file",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path of the .ics file to write"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Start of the range in ISO format (default: one year ago)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "End of the range in ISO format (default: one year from now)"
+                    }
+                },
+                "required": ["path"]
+            }
+        ),
+        Tool(
+            name="cache_stats",
+            description="Show event cache hit rate and prefetch activity",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
 
-def format_event(event: dict) -> str:
-    """Format an event for display."""
+def format_event(event: dict, zone: str = 'UTC') -> str:
+    """Format an event for display, with times local to ``zone``."""
     summary = event.get('summary', 'No title')
-    start = event.get('start', {}).get('dateTime', event.get('start', {}).get('date', ''))
-    end = event.get('end', {}).get('dateTime', event.get('end', {}).get('date', ''))
+    if 'dateTime' in event.get('start', {}):
+        span = event_span(event, zone)
+        start, end = format_local(span[0], zone), format_local(span[1], zone)
+    else:
+        start = event.get('start', {}).get('date', '')
+        end = event.get('end', {}).get('date', '')
     location = event.get('location', '')
     description = event.get('description', '')
 
@@ -204,16 +520,33 @@ def format_event(event: dict) -> str:
     return output
 
 
+def format_conflicts(conflicts: list) -> str:
+    """Format busy intervals that overlap a slot."""
+    output = ""
+    for conflict in conflicts:
+        output += f"Busy: {conflict['start']} to {conflict['end']}"
+        if conflict.get('summary'):
+            output += f" ({conflict['summary']})"
+        output += "\n"
+    return output
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
     """Handle tool calls."""
+    async with client_lock:
+        return handle_tool(name, arguments)
+
+
+def handle_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Run a tool call against the calendar client."""
     client = get_calendar_client()
 
     if name == "list_events":
         max_results = arguments.get("max_results", 10)
         days_ahead = arguments.get("days_ahead", 7)
 
-        time_min = datetime.utcnow()
+        time_min = datetime.now(timezone.utc)
         time_max = time_min + timedelta(days=days_ahead)
 
         events = client.list_events(
@@ -228,7 +561,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         output = f"Found {len(events)} upcoming event(s):\n\n"
         for i, event in enumerate(events, 1):
             output += f"--- Event {i} ---\n"
-            output += format_event(event)
+            output += format_event(event, client.timezone)
             output += "\n"
 
         return [TextContent(type="text", text=output)]
@@ -242,7 +575,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         output = f"Today's events ({len(events)} total):\n\n"
         for i, event in enumerate(events, 1):
             output += f"--- Event {i} ---\n"
-            output += format_event(event)
+            output += format_event(event, client.timezone)
             output += "\n"
 
         return [TextContent(type="text", text=output)]
@@ -254,19 +587,32 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         description = arguments.get("description", "")
         location = arguments.get("location", "")
         attendees = arguments.get("attendees", [])
-
-        event = client.create_event(
-            summary=summary,
-            start_time=start_time,
-            end_time=end_time,
-            description=description,
-            location=location,
-            attendees=attendees
-        )
+        conflict_policy = arguments.get("conflict_policy", "warn")
+
+        try:
+            event = client.create_event(
+                summary=summary,
+                start_time=start_time,
+                end_time=end_time,
+                description=description,
+                location=location,
+                attendees=attendees,
+                conflict_policy=conflict_policy
+            )
+        except SchedulingConflictError as error:
+            output = f"❌ Event not created: {len(error.conflicts)} conflict(s):\n\n"
+            output += format_conflicts(error.conflicts)
+            return [TextContent(type="text", text=output)]
+        except ConflictCheckError as error:
+            return [TextContent(type="text", text=f"❌ Event not created: {error}")]
 
         if event:
             output = "✅ Event created successfully!\n\n"
-            output += format_event(event)
+            output += format_event(event, client.timezone)
+            conflicts = event.get('conflicts', [])
+            if conflicts:
+                output += f"\n⚠️ Overlaps {len(conflicts)} busy period(s):\n"
+                output += format_conflicts(conflicts)
             return [TextContent(type="text", text=output)]
         else:
             return [TextContent(type="text", text="❌ Failed to create event.")]
@@ -283,7 +629,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         output = f"Found {len(events)} event(s) matching '{query}':\n\n"
         for i, event in enumerate(events, 1):
             output += f"--- Event {i} ---\n"
-            output += format_event(event)
+            output += format_event(event, client.timezone)
             output += "\n"
 
         return [TextContent(type="text", text=output)]
@@ -309,17 +655,31 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         if "end_time" in arguments:
             end_time = datetime.fromisoformat(arguments["end_time"])
 
-        event = client.update_event(
-            event_id=event_id,
-            summary=summary,
-            start_time=start_time,
-            end_time=end_time,
-            description=description
-        )
+        conflict_policy = arguments.get("conflict_policy", "warn")
+
+        try:
+            event = client.update_event(
+                event_id=event_id,
+                summary=summary,
+                start_time=start_time,
+                end_time=end_time,
+                description=description,
+                conflict_policy=conflict_policy
+            )
+        except SchedulingConflictError as error:
+            output = f"❌ Event not updated: {len(error.conflicts)} conflict(s):\n\n"
+            output += format_conflicts(error.conflicts)
+            return [TextContent(type="text", text=output)]
+        except ConflictCheckError as error:
+            return [TextContent(type="text", text=f"❌ Event not updated: {error}")]
 
         if event:
             output = "✅ Event updated successfully!\n\n"
-            output += format_event(event)
+            output += format_event(event, client.timezone)
+            conflicts = event.get('conflicts', [])
+            if conflicts:
+                output += f"\n⚠️ Overlaps {len(conflicts)} busy period(s):\n"
+                output += format_conflicts(conflicts)
             return [TextContent(type="text", text=output)]
         else:
             return [TextContent(type="text", text="❌ Failed to update event.")]
@@ -340,23 +700,253 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageCo
         else:
             output = f"❌ You have {len(busy_periods)} conflict(s):\n\n"
             for period in busy_periods:
-                output += f"Busy: {period['start']} to {period['end']}\n"
+                start = format_local(to_epoch(period['start']), client.timezone)
+                end = format_local(to_epoch(period['end']), client.timezone)
+                output += f"Busy: {start} to {end}\n"
             return [TextContent(type="text", text=output)]
 
+    elif name == "validate_schedule":
+        proposed = [
+            {
+                "summary": item.get("summary", ""),
+                "start_time": datetime.fromisoformat(item["start_time"]),
+                "end_time": datetime.fromisoformat(item["end_time"]),
+            }
+            for item in arguments["events"]
+        ]
+
+        try:
+            results = client.validate_schedule(proposed)
+        except ConflictCheckError as error:
+            return [TextContent(type="text", text=f"❌ Could not check the schedule: {error}")]
+        clashing = [
+            (i, result) for i, result in enumerate(results, 1)
+            if result['calendar_conflicts'] or result['batch_conflicts']
+        ]
+
+        if not clashing:
+            return [TextContent(
+                type="text",
+                text=f"✅ All {len(results)} proposed event(s) are conflict-free"
+            )]
+
+        output = f"❌ {len(clashing)} of {len(results)} proposed event(s) have conflicts:\n\n"
+        for i, result in clashing:
+            output += f"--- Proposed event {i}: {result['summary'] or 'No title'} ---\n"
+            output += f"Start: {result['start']}\n"
+            output += f"End: {result['end']}\n"
+            if result['batch_conflicts']:
+                others = ", ".join(str(j + 1) for j in result['batch_conflicts'])
+                output += f"Overlaps proposed event(s): {others}\n"
+            output += format_conflicts(result['calendar_conflicts'])
+            output += "\n"
+        return [TextContent(type="text", text=output)]
+
+    elif name == "schedule_meetings":
+        if "start_date" in arguments:
+            time_min = datetime.fromisoformat(arguments["start_date"])
+        else:
+            time_min = datetime.now(timezone.utc)
+        if "end_date" in arguments:
+            time_max = datetime.fromisoformat(arguments["end_date"])
+        else:
+            time_max = time_min + timedelta(days=7)
+
+        meetings = []
+        for item in arguments["meetings"]:
+            meeting = dict(item)
+            if "windows" in item:
+                meeting["windows"] = [
+                    (datetime.fromisoformat(w["start"]), datetime.fromisoformat(w["end"]))
+                    for w in item["windows"]
+                ]
+            meetings.append(meeting)
+
+        try:
+            plan = client.schedule_meetings(
+                meetings,
+                time_min,
+                time_max,
+                work_hours=(
+                    arguments.get("work_start_hour", 9),
+                    arguments.get("work_end_hour", 17)
+                ),
+                include_weekends=arguments.get("include_weekends", False),
+                time_limit=arguments.get("time_limit_seconds", 2.0),
+                book=arguments.get("book", False)
+            )
+        except ValueError as error:
+            return [TextContent(type="text", text=f"❌ {error}")]
+
+        stats = plan['stats']
+        if plan['scheduled']:
+            if arguments.get("book"):
+                output = f"✅ Booked {len(plan['booked'])} of {stats['meetings']} meeting(s):\n\n"
+            else:
+                output = f"✅ Planned {len(plan['scheduled'])} of {stats['meetings']} meeting(s):\n\n"
+        else:
+            output = f"❌ None of the {stats['meetings']} meeting(s) could be placed\n\n"
+
+        for item in plan['scheduled']:
+            output += f"--- {item['summary']} ---\n"
+            output += f"Start: {item['start']}\n"
+            output += f"End: {item['end']}\n"
+            request = arguments["meetings"][item['index']]
+            missing = [
+                email for email in request.get("optional_attendees", [])
+                if email not in item['optional']
+            ]
+            if missing:
+                output += f"Optional attendees unavailable: {', '.join(missing)}\n"
+            output += "\n"
+
+        if plan['unscheduled']:
+            output += "Not scheduled:\n"
+            for item in plan['unscheduled']:
+                output += f"- {item['summary']}: {item['reason']}\n"
+        if plan['unknown_attendees']:
+            output += (
+                f"⚠️ Free/busy unavailable (assumed free): "
+                f"{', '.join(plan['unknown_attendees'])}\n"
+            )
+        for error in plan.get('errors', []):
+            output += f"❌ Booking failed: {error}\n"
+
+        if stats['complete']:
+            search = "optimal"
+        elif stats['priority_optimal']:
+            search = "optimal placement, optional attendance best found within the time limit"
+        else:
+            search = "best found within the time limit"
+        output += f"\nSolved in {stats['seconds'] * 1000:.0f} ms ({search})\n"
+        return [TextContent(type="text", text=output)]
+
+    elif name == "calendar_stats":
+        zone = client.timezone
+        if "end_date" in arguments:
+            time_max = to_epoch(datetime.fromisoformat(arguments["end_date"]), zone)
+        else:
+            # Through the end of today, so repeated calls share one cached window
+            _, time_max = day_bounds(to_epoch(datetime.now(timezone.utc)), zone)
+        if "start_date" in arguments:
+            time_min = to_epoch(datetime.fromisoformat(arguments["start_date"]), zone)
+        else:
+            time_min = time_max - arguments.get("days_back", 90) * 86400
+
+        try:
+            stats = get_calendar_analytics().stats(
+                time_min,
+                time_max,
+                group_by=arguments.get("group_by", "week"),
+                keyword=arguments.get("keyword"),
+                attendee=arguments.get("attendee"),
+                top=arguments.get("top", 10)
+            )
+        except HttpError as error:
+            return [TextContent(type="text", text=f"❌ Could not load events for stats: {error}")]
+
+        output = f"📊 {stats['window']['start']} to {stats['window']['end']}"
+        filters = [
+            f"{key}: {arguments[key]}" for key in ("keyword", "attendee") if arguments.get(key)
+        ]
+        if filters:
+            output += f" ({', '.join(filters)})"
+        output += "\n"
+        output += f"Events: {stats['events']}\n"
+        output += f"Meeting hours: {stats['meeting_hours']}\n"
+        output += f"Busy hours (overlaps merged): {stats['busy_hours']}\n"
+
+        if stats['groups']:
+            output += f"\nBy {arguments.get('group_by', 'week')}:\n"
+            for group in stats['groups']:
+                output += (
+                    f"{group['key']}: {group['meeting_hours']}h in {group['events']} event(s)"
+                    f", {group['busy_hours']}h busy\n"
+                )
+
+        return [TextContent(type="text", text=output)]
+
+    elif name == "import_ics":
+        path = arguments["path"]
+
+        try:
+            result = client.import_ics(path, timezone=arguments.get("timezone"))
+        except (OSError, UnicodeDecodeError) as error:
+            return [TextContent(type="text", text=f"❌ Could not read {path}: {error}")]
+
+        output = f"✅ Imported {result['imported']} event(s) from {path}\n"
+        if result['skipped']:
+            output += f"Skipped {result['skipped']} event(s) already in the calendar\n"
+        if result['failed']:
+            output += f"❌ {result['failed']} event(s) failed\n"
+        for error in result['errors']:
+            output += f"❌ {error}\n"
+
+        return [TextContent(type="text", text=output)]
+
+    elif name == "export_ics":
+        path = arguments["path"]
+        now = datetime.now(timezone.utc)
+        if "start_date" in arguments:
+            time_min = datetime.fromisoformat(arguments["start_date"])
+        else:
+            time_min = now - timedelta(days=365)
+        if "end_date" in arguments:
+            time_max = datetime.fromisoformat(arguments["end_date"])
+        else:
+            time_max = now + timedelta(days=365)
+
+        try:
+            count = client.export_ics(path, time_min, time_max)
+        except OSError as error:
+            return [TextContent(type="text", text=f"❌ Could not write {path}: {error}")]
+        except HttpError as error:
+            return [TextContent(
+                type="text",
+                text=f"❌ Export failed part-way; {path} is incomplete: {error}"
+            )]
+
+        return [TextContent(type="text", text=f"✅ Exported {count} event(s) to {path}")]
+
+    elif name == "cache_stats":
+        cache = client.event_cache
+        output = f"Cache hits: {cache.hits}\n"
+        output += f"Cache misses: {cache.misses}\n"
+        output += f"Hit rate: {cache.hit_rate:.1%}\n"
+
+        if prefetcher is None:
+            output += "Prefetch: disabled\n"
+        else:
+            stats = prefetcher.stats()
+            output += f"Prefetch requests: {stats['prefetches']}\n"
+            output += f"Budget used this hour: {stats['budget_used']}/{stats['budget_per_hour']}\n"
+            windows = ", ".join(
+                f"day {offset:+d} for {days}d" for offset, days in stats['windows']
+            )
+            output += f"Warm windows: {windows}\n"
+
+        return [TextContent(type="text", text=output)]
+
     else:
         raise ValueError(f"Unknown tool: {name}")
 
 
 async def main():
     """Run the MCP server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    prefetch_task = None
+    if os.environ.get('CALENDAR_PREFETCH', '1') != '0':
+        prefetch_task = asyncio.create_task(run_prefetcher())
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if prefetch_task is not None:
+            prefetch_task.cancel()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,401 @@
+"""Vectorized calendar analytics.
+
+Events for a window are loaded once into NumPy arrays (start/end epochs plus
+integer codes for calendar, summary and attendees) and every aggregation is
+then computed with array operations instead of walking formatted events.
+"""
+
+import time
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+from .timezones import UTC, event_span, format_local, to_epoch, transitions
+
+GROUP_BY_OPTIONS = ('none', 'day', 'week', 'month', 'attendee', 'calendar')
+
+# Only what the aggregations need, to keep paged responses small
+EVENT_FIELDS = (
+    'nextPageToken,'
+    'items(id,status,summary,start,end,attendees(email,self,resource))'
+)
+
+
+def union_seconds(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    groups: Optional[np.ndarray] = None,
+    n_groups: int = 1
+) -> np.ndarray:
+    """Total covered time of possibly overlapping intervals, per group.
+
+    Overlapping intervals are merged so double-booked time is counted once.
+    Groups are handled in one pass by shifting each group onto its own
+    disjoint stretch of the time axis.
+
+    Args:
+        starts: Interval starts in epoch seconds
+        ends: Interval ends in epoch seconds
+        groups: Group code per interval (default: a single group)
+        n_groups: Number of group codes
+
+    Returns:
+        Array of covered seconds indexed by group code
+    """
+    if len(starts) == 0:
+        return np.zeros(n_groups, dtype=np.int64)
+    if groups is None:
+        groups = np.zeros(len(starts), dtype=np.int64)
+
+    origin = starts.min()
+    stride = int(ends.max() - origin) + 1
+    offset = groups.astype(np.int64) * stride - origin
+    shifted_starts = starts + offset
+    shifted_ends = ends + offset
+
+    order = np.argsort(shifted_starts, kind='stable')
+    shifted_starts = shifted_starts[order]
+    shifted_ends = shifted_ends[order]
+    groups = groups[order]
+
+    # A new block starts wherever an interval begins after everything before it ended
+    running_end = np.maximum.accumulate(shifted_ends)
+    new_block = np.empty(len(order), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = shifted_starts[1:] > running_end[:-1]
+    block_index = np.flatnonzero(new_block)
+
+    block_starts = shifted_starts[block_index]
+    block_ends = np.maximum.reduceat(shifted_ends, block_index)
+    return np.bincount(
+        groups[block_index],
+        weights=block_ends - block_starts,
+        minlength=n_groups
+    ).astype(np.int64)
+
+
+class EventTable:
+    """Columnar, integer-coded view of a set of timed events."""
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        calendar_codes: np.ndarray,
+        summary_codes: np.ndarray,
+        attendee_ptr: np.ndarray,
+        attendee_codes: np.ndarray,
+        calendars: List[str],
+        summaries: List[str],
+        attendees: List[str]
+    ):
+        """Initialize the table from prebuilt columns.
+
+        Args:
+            starts: Event starts in epoch seconds
+            ends: Event ends in epoch seconds
+            calendar_codes: Index into ``calendars`` per event
+            summary_codes: Index into ``summaries`` per event
+            attendee_ptr: CSR offsets; event ``i`` has attendees
+                ``attendee_codes[attendee_ptr[i]:attendee_ptr[i + 1]]``
+            attendee_codes: Index into ``attendees`` per attendance
+            calendars: Calendar ID per code
+            summaries: Event title per code
+            attendees: Attendee email per code
+        """
+        self.starts = starts
+        self.ends = ends
+        self.calendar_codes = calendar_codes
+        self.summary_codes = summary_codes
+        self.attendee_ptr = attendee_ptr
+        self.attendee_codes = attendee_codes
+        self.calendars = calendars
+        self.summaries = summaries
+        self.attendees = attendees
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_events(cls, events: Iterable[Tuple[str, Dict[str, Any]]]) -> 'EventTable':
+        """Build a table from ``(calendar_id, event)`` pairs.
+
+        All-day and cancelled events are skipped; the organizer's own
+        attendance and room resources are not counted as attendees.
+        """
+        calendar_lookup: Dict[str, int] = {}
+        summary_lookup: Dict[str, int] = {}
+        attendee_lookup: Dict[str, int] = {}
+        starts, ends, calendar_codes, summary_codes = [], [], [], []
+        attendee_ptr, attendee_codes = [0], []
+
+        for calendar_id, event in events:
+            if ('dateTime' not in event.get('start', {})
+                    or 'dateTime' not in event.get('end', {})
+                    or event.get('status') == 'cancelled'):
+                continue
+
+            start, end = event_span(event)
+            starts.append(start)
+            ends.append(end)
+            calendar_codes.append(calendar_lookup.setdefault(calendar_id, len(calendar_lookup)))
+            summary = event.get('summary', '')
+            summary_codes.append(summary_lookup.setdefault(summary, len(summary_lookup)))
+            seen = set()
+            for attendee in event.get('attendees', []):
+                if attendee.get('self') or attendee.get('resource') or not attendee.get('email'):
+                    continue
+                code = attendee_lookup.setdefault(attendee['email'].lower(), len(attendee_lookup))
+                if code not in seen:
+                    seen.add(code)
+                    attendee_codes.append(code)
+            attendee_ptr.append(len(attendee_codes))
+
+        return cls(
+            starts=np.array(starts, dtype=np.int64),
+            ends=np.array(ends, dtype=np.int64),
+            calendar_codes=np.array(calendar_codes, dtype=np.int32),
+            summary_codes=np.array(summary_codes, dtype=np.int32),
+            attendee_ptr=np.array(attendee_ptr, dtype=np.int64),
+            attendee_codes=np.array(attendee_codes, dtype=np.int32),
+            calendars=list(calendar_lookup),
+            summaries=list(summary_lookup),
+            attendees=list(attendee_lookup),
+        )
+
+    def subset(self, selected: np.ndarray) -> 'EventTable':
+        """Table of the selected events, sharing this table's code lists."""
+        return EventTable(
+            starts=self.starts[selected],
+            ends=self.ends[selected],
+            calendar_codes=self.calendar_codes[selected],
+            summary_codes=self.summary_codes[selected],
+            attendee_ptr=np.concatenate(([0], np.cumsum(np.diff(self.attendee_ptr)[selected]))),
+            attendee_codes=self.attendee_codes[_csr_rows(self.attendee_ptr, selected)],
+            calendars=self.calendars,
+            summaries=self.summaries,
+            attendees=self.attendees,
+        )
+
+    def mask(
+        self,
+        keyword: Optional[str] = None,
+        attendee: Optional[str] = None,
+        calendar_id: Optional[str] = None
+    ) -> np.ndarray:
+        """Boolean mask of events matching all given filters.
+
+        Args:
+            keyword: Case-insensitive substring of the event title
+            attendee: Case-insensitive substring of an attendee email
+            calendar_id: Exact calendar ID
+        """
+        selected = np.ones(len(self), dtype=bool)
+
+        if keyword:
+            # Match against distinct titles only, then broadcast by code
+            needle = keyword.lower()
+            matching = np.array([needle in s.lower() for s in self.summaries], dtype=bool)
+            selected &= matching[self.summary_codes]
+
+        if attendee:
+            needle = attendee.lower()
+            matching = np.array([needle in a for a in self.attendees], dtype=bool)
+            hits = matching[self.attendee_codes].astype(np.int64)
+            # Count hits per event over its CSR slice
+            per_event = np.add.reduceat(np.append(hits, 0), self.attendee_ptr[:-1])
+            per_event[self.attendee_ptr[:-1] == self.attendee_ptr[1:]] = 0
+            selected &= per_event > 0
+
+        if calendar_id:
+            if calendar_id in self.calendars:
+                selected &= self.calendar_codes == self.calendars.index(calendar_id)
+            else:
+                selected[:] = False
+
+        return selected
+
+    def summarize(
+        self,
+        group_by: str = 'week',
+        keyword: Optional[str] = None,
+        attendee: Optional[str] = None,
+        calendar_id: Optional[str] = None,
+        top: int = 10,
+        timezone: str = UTC
+    ) -> Dict[str, Any]:
+        """Aggregate meeting time, optionally grouped.
+
+        Meeting hours add up event durations; busy hours merge overlaps so
+        double-booked time is counted once. Time buckets are assigned by the
+        local date of each event's start.
+
+        Args:
+            group_by: One of ``GROUP_BY_OPTIONS``
+            keyword: Only count events whose title contains this
+            attendee: Only count events with a matching attendee
+            calendar_id: Only count events from this calendar
+            top: Maximum groups returned for attendee/calendar grouping
+            timezone: Zone whose days, weeks and months define time buckets
+
+        Returns:
+            Dict with ``events``, ``meeting_hours``, ``busy_hours`` and ``groups``
+        """
+        if group_by not in GROUP_BY_OPTIONS:
+            raise ValueError(
+                f"Invalid group_by: {group_by!r} "
+                f"(expected one of {', '.join(GROUP_BY_OPTIONS)})"
+            )
+
+        selected = self.mask(keyword=keyword, attendee=attendee, calendar_id=calendar_id)
+        starts = self.starts[selected]
+        ends = self.ends[selected]
+        durations = ends - starts
+
+        summary = {
+            'events': int(selected.sum()),
+            'meeting_hours': _hours(durations.sum()),
+            'busy_hours': _hours(union_seconds(starts, ends)[0]),
+            'groups': [],
+        }
+        if group_by == 'none' or len(starts) == 0:
+            return summary
+
+        if group_by in ('day', 'week', 'month'):
+            codes, labels = _time_buckets(starts, group_by, timezone)
+            order = None
+        elif group_by == 'calendar':
+            codes, labels = self.calendar_codes[selected], self.calendars
+            order = 'hours'
+        else:
+            # Expand events to one row per attendance
+            rows = np.repeat(np.flatnonzero(selected), np.diff(self.attendee_ptr)[selected])
+            attendance = _csr_rows(self.attendee_ptr, selected)
+            codes, labels = self.attendee_codes[attendance], self.attendees
+            starts, ends = self.starts[rows], self.ends[rows]
+            durations = ends - starts
+            order = 'hours'
+
+        n_groups = len(labels)
+        event_counts = np.bincount(codes, minlength=n_groups)
+        meeting = np.bincount(codes, weights=durations, minlength=n_groups)
+        busy = union_seconds(starts, ends, codes, n_groups)
+
+        present = np.flatnonzero(event_counts)
+        if order == 'hours':
+            # Ties go by name, so the order does not depend on code assignment
+            present = present[np.argsort([labels[code] for code in present], kind='stable')]
+            present = present[np.argsort(-meeting[present], kind='stable')][:top]
+
+        summary['groups'] = [
+            {
+                'key': labels[code],
+                'events': int(event_counts[code]),
+                'meeting_hours': _hours(meeting[code]),
+                'busy_hours': _hours(busy[code]),
+            }
+            for code in present
+        ]
+        return summary
+
+
+def _hours(seconds) -> float:
+    return round(float(seconds) / 3600, 2)
+
+
+def _csr_rows(ptr: np.ndarray, selected: np.ndarray) -> np.ndarray:
+    """Indexes into the CSR value array for the selected rows."""
+    lengths = np.diff(ptr)[selected]
+    if lengths.sum() == 0:
+        return np.zeros(0, dtype=np.int64)
+    row_starts = ptr[:-1][selected]
+    # Position within each row, via a running counter reset at row boundaries
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(row_starts, lengths) + offsets
+
+
+def _time_buckets(
+    starts: np.ndarray,
+    group_by: str,
+    timezone: str
+) -> Tuple[np.ndarray, List[str]]:
+    """Map epoch starts to dense local bucket codes and ISO date labels."""
+    # Shift to local wall time with one searchsorted over the offset transitions
+    epochs, offsets = transitions(timezone, int(starts.min()), int(starts.max()))
+    index = np.searchsorted(np.array(epochs, dtype=np.int64), starts, side='right') - 1
+    local = starts + np.array(offsets, dtype=np.int64)[np.maximum(index, 0)]
+    days = local.astype('datetime64[s]').astype('datetime64[D]')
+    if group_by == 'day':
+        buckets = days
+    elif group_by == 'week':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        buckets = days - (days.astype(np.int64) + 3) % 7
+    else:
+        buckets = days.astype('datetime64[M]').astype('datetime64[D]')
+    unique, codes = np.unique(buckets, return_inverse=True)
+    return codes.reshape(-1), [str(day) for day in unique]
+
+
+class CalendarAnalytics:
+    """Loads event tables through a calendar client and caches them briefly."""
+
+    def __init__(self, client, ttl: int = 300):
+        """Initialize analytics.
+
+        Args:
+            client: GoogleCalendarClient used to page through events
+            ttl: Seconds a loaded window is reused before reloading
+        """
+        self.client = client
+        self.ttl = ttl
+        self._tables: Dict[Tuple, Tuple[float, EventTable]] = {}
+
+    def table(self, time_min, time_max, calendar_ids: List[str]) -> EventTable:
+        """Get the event table for a window, loading it if needed.
+
+        A fresh table loaded for a wider window is reused, keeping only the
+        events that overlap the requested one. A load that fails part-way
+        raises and caches nothing.
+        """
+        zone = self.client.timezone
+        start, end = to_epoch(time_min, zone), to_epoch(time_max, zone)
+        key = (start, end, tuple(calendar_ids))
+        for (cached_start, cached_end, cached_ids), (loaded, table) in self._tables.items():
+            if (cached_ids == key[2] and cached_start <= start and end <= cached_end
+                    and time.monotonic() - loaded < self.ttl):
+                if (cached_start, cached_end) == (start, end):
+                    return table
+                return table.subset((table.ends > start) & (table.starts < end))
+
+        def pairs():
+            for calendar_id in calendar_ids:
+                for event in self.client.iter_events(
+                    time_min, time_max, calendar_id=calendar_id, fields=EVENT_FIELDS
+                ):
+                    yield calendar_id, event
+
+        table = EventTable.from_events(pairs())
+        self._tables = {
+            k: v for k, v in self._tables.items()
+            if time.monotonic() - v[0] < self.ttl
+        }
+        self._tables[key] = (time.monotonic(), table)
+        return table
+
+    def stats(
+        self,
+        time_min,
+        time_max,
+        calendar_ids: Optional[List[str]] = None,
+        **filters
+    ) -> Dict[str, Any]:
+        """Summarize a window; ``filters`` are passed to ``EventTable.summarize``."""
+        zone = self.client.timezone
+        calendar_ids = calendar_ids or ['primary']
+        table = self.table(time_min, time_max, calendar_ids)
+        summary = table.summarize(timezone=zone, **filters)
+        summary['window'] = {
+            'start': format_local(to_epoch(time_min, zone), zone),
+            'end': format_local(to_epoch(time_max, zone), zone),
+        }
+        return summary
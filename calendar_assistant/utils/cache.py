@@ -0,0 +1,112 @@
+"""Cache of complete event listings for time windows.
+
+A cached window holds every event overlapping it, so any narrower query
+(e.g. "the next 7 days from now" inside a prefetched 8-day window) can be
+answered locally by filtering and truncating.
+"""
+
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional
+
+from .timezones import event_span
+
+
+class _Window:
+    __slots__ = ('start', 'end', 'fetched_at', 'spans', 'events')
+
+    def __init__(self, start: int, end: int, events: List[Dict[str, Any]]):
+        self.start = start
+        self.end = end
+        self.fetched_at = time.monotonic()
+        self.spans = [event_span(event) for event in events]
+        self.events = events
+
+
+class EventWindowCache:
+    """Complete event listings per calendar, with hit/miss accounting."""
+
+    def __init__(self, ttl: int = 300, max_windows: int = 32):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a window is served before it must be refetched
+            max_windows: Windows kept per calendar; oldest are evicted first
+        """
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self.hits = 0
+        self.misses = 0
+        # Recently requested (calendar_id, start, end, epoch time) for prefetch learning
+        self.requests = deque(maxlen=256)
+        self._windows: Dict[str, List[_Window]] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(
+        self,
+        calendar_id: str,
+        start: int,
+        end: int,
+        max_results: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Serve a listing from a fresh window covering ``[start, end)``.
+
+        Returns:
+            Up to ``max_results`` events in start order, or None on a miss
+        """
+        self.requests.append((calendar_id, start, end, time.time()))
+        window = self._covering(calendar_id, start, end)
+        if window is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        found = []
+        for (event_start, event_end), event in zip(window.spans, window.events):
+            if event_end > start and event_start < end:
+                found.append(event)
+                if len(found) >= max_results:
+                    break
+        return found
+
+    def store(self, calendar_id: str, start: int, end: int, events: List[Dict[str, Any]]):
+        """Store a complete listing of ``[start, end)``, replacing narrower windows."""
+        windows = [
+            w for w in self._windows.get(calendar_id, [])
+            if not (w.start >= start and w.end <= end) and self._is_fresh(w)
+        ]
+        windows.append(_Window(start, end, events))
+        self._windows[calendar_id] = windows[-self.max_windows:]
+
+    def age(self, calendar_id: str, start: int, end: int) -> Optional[float]:
+        """Seconds since the freshest window covering ``[start, end)`` was fetched."""
+        window = self._covering(calendar_id, start, end)
+        if window is None:
+            return None
+        return time.monotonic() - window.fetched_at
+
+    def invalidate(self, calendar_id: str, start: Optional[int] = None, end: Optional[int] = None):
+        """Drop windows overlapping ``[start, end)``, or all of a calendar's windows."""
+        if start is None or end is None:
+            self._windows.pop(calendar_id, None)
+            return
+        self._windows[calendar_id] = [
+            w for w in self._windows.get(calendar_id, [])
+            if w.end <= start or w.start >= end
+        ]
+
+    def _covering(self, calendar_id: str, start: int, end: int) -> Optional[_Window]:
+        best = None
+        for window in self._windows.get(calendar_id, []):
+            if window.start <= start and window.end >= end and self._is_fresh(window):
+                if best is None or window.fetched_at > best.fetched_at:
+                    best = window
+        return best
+
+    def _is_fresh(self, window: _Window) -> bool:
+        return time.monotonic() - window.fetched_at < self.ttl
@@ -0,0 +1,331 @@
+"""Local conflict detection for calendar events.
+
+Busy intervals seen through event listings and free/busy queries are kept in
+an interval tree per calendar, so new or moved events can be checked for
+overlaps without another round trip to the Google Calendar API.
+"""
+
+import heapq
+import random
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+CONFLICT_POLICIES = ('allow', 'warn', 'reject')
+
+
+class SchedulingConflictError(Exception):
+    """Raised when an event is rejected because it overlaps busy time."""
+
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        self.conflicts = conflicts
+        super().__init__(f"{len(conflicts)} conflicting busy interval(s)")
+
+
+class ConflictCheckError(Exception):
+    """Raised when the busy time around a slot could not be read."""
+
+
+class _Node:
+    __slots__ = ('item', 'priority', 'max_end', 'left', 'right')
+
+    def __init__(self, item: Tuple[int, int, str]):
+        self.item = item
+        self.priority = random.random()
+        self.max_end = item[1]
+        self.left = None
+        self.right = None
+
+    def update(self):
+        max_end = self.item[1]
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTree:
+    """Treap of half-open ``[start, end)`` intervals augmented with max end.
+
+    Insert, remove and overlap queries run in expected O(log n + k).
+    """
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.item
+            node = node.right
+
+    def insert(self, start: int, end: int, key: str = ''):
+        """Insert an interval identified by ``key``."""
+        item = (start, end, key)
+        left, right = self._split(self._root, item)
+        self._root = self._merge(self._merge(left, _Node(item)), right)
+        self._size += 1
+
+    def remove(self, start: int, end: int, key: str = '') -> bool:
+        """Remove an interval. Returns True if it was present."""
+        item = (start, end, key)
+        self._root, removed = self._remove(self._root, item)
+        if removed:
+            self._size -= 1
+        return removed
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[int, int, str]]:
+        """Return all intervals overlapping ``[start, end)`` in start order."""
+        found = []
+        # Iterative in-order walk, pruning subtrees that cannot overlap
+        pending = []
+        node = self._root
+        while pending or node is not None:
+            while node is not None and node.max_end > start:
+                pending.append(node)
+                node = node.left
+            if not pending:
+                break
+            node = pending.pop()
+            if node.item[0] >= end:
+                break
+            if node.item[1] > start:
+                found.append(node.item)
+            node = node.right
+        return found
+
+    def _split(self, node, item):
+        # Returns (items < item, items >= item)
+        if node is None:
+            return None, None
+        if node.item < item:
+            left, right = self._split(node.right, item)
+            node.right = left
+            node.update()
+            return node, right
+        left, right = self._split(node.left, item)
+        node.left = right
+        node.update()
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    def _remove(self, node, item):
+        if node is None:
+            return None, False
+        if item == node.item:
+            return self._merge(node.left, node.right), True
+        if item < node.item:
+            node.left, removed = self._remove(node.left, item)
+        else:
+            node.right, removed = self._remove(node.right, item)
+        if removed:
+            node.update()
+        return node, removed
+
+
+class BusyIndex:
+    """Known busy intervals and fetched coverage for a single calendar.
+
+    Intervals coming from event listings carry the event ID; intervals coming
+    from free/busy queries are anonymous. Free/busy merges overlapping events
+    into one block, so anonymous intervals only cover busy time that no
+    indexed event accounts for, and each busy block is reported once.
+    """
+
+    def __init__(self, ttl: int = 300):
+        """Initialize the index.
+
+        Args:
+            ttl: Seconds a fetched window is trusted before it must be refetched
+        """
+        self.ttl = ttl
+        self._tree = IntervalTree()
+        self._spans: Dict[Tuple[int, int], set] = {}
+        self._events: Dict[str, Tuple[int, int, str]] = {}
+        # (start, end, fetched at, whether events were listed with their IDs)
+        self._coverage: List[Tuple[int, int, float, bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def is_covered(self, start: int, end: int, listed: bool = False) -> bool:
+        """Check whether ``[start, end)`` lies inside recently fetched windows.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+            listed: Only count windows whose events were listed with their IDs
+        """
+        now = time.monotonic()
+        self._coverage = [c for c in self._coverage if now - c[2] < self.ttl]
+        reached = start
+        for cov_start, cov_end, _, cov_listed in sorted(self._coverage):
+            if listed and not cov_listed:
+                continue
+            if cov_start > reached:
+                break
+            reached = max(reached, cov_end)
+            if reached >= end:
+                return True
+        return reached >= end
+
+    def mark_covered(self, start: int, end: int, listed: bool = False):
+        """Record that all busy time in ``[start, end)`` has been indexed.
+
+        ``listed`` marks windows indexed from event listings, where every
+        busy interval carries its event ID.
+        """
+        self._coverage.append((start, end, time.monotonic(), listed))
+
+    def clear_window(self, start: int, end: int):
+        """Drop the busy time inside ``[start, end)``.
+
+        Events lying entirely inside are dropped; anonymous intervals that
+        reach outside the window keep only their parts outside it.
+        """
+        for item in self._tree.overlapping(start, end):
+            if item[0] >= start and item[1] <= end:
+                self._discard(*item)
+            elif not item[2]:
+                self._discard(*item)
+                self.add_busy(item[0], start)
+                self.add_busy(end, item[1])
+
+    def replace_window(self, start: int, end: int, spans: List[Tuple[int, int]]):
+        """Replace the busy time inside ``[start, end)`` with fresh spans.
+
+        Indexed events that still lie inside a busy span keep their ID and
+        summary, and only the parts of each span they do not account for
+        are added as anonymous busy time.
+        """
+        spans = sorted(spans)
+        for item in self._tree.overlapping(start, end):
+            if item[0] < start or item[1] > end:
+                continue
+            if not item[2] or not any(s <= item[0] and item[1] <= e for s, e in spans):
+                self._discard(*item)
+
+        for span_start, span_end in spans:
+            cursor = span_start
+            for item_start, item_end, _ in sorted(self._tree.overlapping(span_start, span_end)):
+                if item_start > cursor:
+                    self.add_busy(cursor, item_start)
+                cursor = max(cursor, item_end)
+            if cursor < span_end:
+                self.add_busy(cursor, span_end)
+
+    def add_busy(self, start: int, end: int, event_id: Optional[str] = None, summary: str = ''):
+        """Add a busy interval, optionally tied to an event."""
+        if end <= start:
+            return
+        keys = self._spans.get((start, end), set())
+        if event_id is None:
+            if keys:
+                return
+            self._insert(start, end, '')
+            return
+
+        self.remove_event(event_id)
+        if '' in keys:
+            self._discard(start, end, '')
+        self._insert(start, end, event_id)
+        self._events[event_id] = (start, end, summary)
+
+    def remove_event(self, event_id: str) -> bool:
+        """Remove an event's interval. Returns True if it was indexed."""
+        known = self._events.pop(event_id, None)
+        if known is None:
+            return False
+        self._discard(known[0], known[1], event_id)
+        return True
+
+    def conflicts(
+        self,
+        start: int,
+        end: int,
+        exclude_event_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return busy intervals overlapping ``[start, end)``.
+
+        Args:
+            start: Start of the proposed slot in epoch seconds
+            end: End of the proposed slot in epoch seconds
+            exclude_event_id: Event to ignore, e.g. the one being moved
+
+        Returns:
+            List of dicts with ``start``, ``end``, ``event_id`` and ``summary``
+        """
+        found = []
+        for item_start, item_end, key in self._tree.overlapping(start, end):
+            if exclude_event_id is not None and key == exclude_event_id:
+                continue
+            found.append({
+                'start': item_start,
+                'end': item_end,
+                'event_id': key or None,
+                'summary': self._events[key][2] if key else '',
+            })
+        return found
+
+    def _insert(self, start: int, end: int, key: str):
+        self._tree.insert(start, end, key)
+        self._spans.setdefault((start, end), set()).add(key)
+
+    def _discard(self, start: int, end: int, key: str):
+        if not self._tree.remove(start, end, key):
+            return
+        keys = self._spans.get((start, end))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._spans[(start, end)]
+        if key:
+            self._events.pop(key, None)
+
+
+def find_batch_conflicts(intervals: List[Tuple[int, int]]) -> List[List[int]]:
+    """Find mutual overlaps within a batch of intervals with one sweep.
+
+    Args:
+        intervals: ``(start, end)`` pairs in epoch seconds
+
+    Returns:
+        For each interval, the indexes of the other intervals it overlaps
+    """
+    overlaps: List[List[int]] = [[] for _ in intervals]
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i])
+    active: List[Tuple[int, int]] = []
+
+    for i in order:
+        start, end = intervals[i]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, j in active:
+            overlaps[i].append(j)
+            overlaps[j].append(i)
+        heapq.heappush(active, (end, i))
+
+    for found in overlaps:
+        found.sort()
+    return overlaps
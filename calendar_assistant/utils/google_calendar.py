@@ -2,9 +2,12 @@
 
 import os
 import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Callable, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -13,23 +16,66 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pytz
 
+from . import ics
+from .cache import EventWindowCache
+from .conflicts import (
+    CONFLICT_POLICIES,
+    BusyIndex,
+    ConflictCheckError,
+    SchedulingConflictError,
+    find_batch_conflicts,
+)
+from .scheduler import MeetingRequest, MeetingSolver
+from .timezones import (
+    UTC,
+    day_bounds,
+    event_span,
+    format_local,
+    from_epoch,
+    is_valid_zone,
+    local_date,
+    normalize_event,
+    to_epoch,
+)
+
 # If modifying these scopes, delete the file token.pickle.
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Calendars a single free/busy query may ask about
+FREEBUSY_MAX_ITEMS = 50
+
 
 class GoogleCalendarClient:
     """Client for Google Calendar API operations."""
 
-    def __init__(self, credentials_file: str = 'credentials.json', token_file: str = 'token.pickle'):
+    def __init__(
+        self,
+        credentials_file: str = 'credentials.json',
+        token_file: str = 'token.pickle',
+        timezone: Optional[str] = None,
+        transport: Optional[Callable[[Any], Any]] = None
+    ):
         """Initialize the Google Calendar client.
 
+        Naive datetimes passed to any method are local time in ``timezone``.
+
         Args:
             credentials_file: Path to OAuth2 credentials JSON file
             token_file: Path to store the access token
+            timezone: IANA timezone (default: the user's calendar setting)
+            transport: Factory taking credentials and returning an
+                httplib2-compatible http object, e.g. ``PooledHttp`` for
+                callers on several threads (default: one keep-alive httplib2
+                connection, the fastest choice for calls made one at a time)
         """
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.service = None
+        self.http = None
+        self._timezone = timezone
+        self._transport = transport
+        self._busy_indexes: Dict[str, BusyIndex] = {}
+        self.event_cache = EventWindowCache()
         self._authenticate()
 
     def _authenticate(self):
@@ -60,7 +106,45 @@ class GoogleCalendarClient:
             with open(self.token_file, 'wb') as token:
                 pickle.dump(creds, token)
 
-        self.service = build('calendar', 'v3', credentials=creds)
+        if self._transport is None:
+            self.service = build('calendar', 'v3', credentials=creds)
+        else:
+            self.http = self._transport(creds)
+            self.service = build('calendar', 'v3', http=self.http)
+
+    @property
+    def timezone(self) -> str:
+        """The user's calendar timezone, resolved once and cached."""
+        if self._timezone is None:
+            self._timezone = self._resolve_timezone()
+        return self._timezone
+
+    def _resolve_timezone(self) -> str:
+        """Read the timezone from settings, falling back to the primary calendar."""
+        lookups = (
+            lambda: self.service.settings().get(setting='timezone').execute().get('value'),
+            lambda: self.service.calendarList().get(calendarId='primary').execute().get('timeZone'),
+        )
+        for lookup in lookups:
+            try:
+                name = lookup()
+            except HttpError as error:
+                # Called from inside MCP tool calls, whose stdout is the protocol stream
+                print(f'Could not read the calendar timezone: {error}', file=sys.stderr)
+                continue
+            if name and is_valid_zone(name):
+                return name
+        return UTC
+
+    def _epoch(self, value: Any) -> int:
+        """Epoch seconds of a datetime, ISO string or epoch in the user's timezone."""
+        return to_epoch(value, self.timezone)
+
+    def _ingest(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record epoch spans on events as they arrive from the API."""
+        for event in events:
+            normalize_event(event, self.timezone)
+        return events
 
     def list_events(
         self,
@@ -74,37 +158,123 @@ class GoogleCalendarClient:
         Args:
             max_results: Maximum number of events to return
             time_min: Start time (defaults to now)
-            time_max: End time (defaults to 1 week from now)
+            time_max: End time (defaults to 1 week from time_min)
             calendar_id: Calendar ID (default: primary)
 
         Returns:
             List of event dictionaries
         """
         try:
-            if time_min is None:
-                time_min = datetime.utcnow()
+            start = self._epoch(time_min) if time_min is not None else int(time.time())
+            end = self._epoch(time_max) if time_max is not None else start + 7 * 86400
 
-            if time_max is None:
-                time_max = time_min + timedelta(days=7)
+            cached = self.event_cache.lookup(calendar_id, start, end, max_results)
+            if cached is not None:
+                return cached
 
             events_result = self.service.events().list(
                 calendarId=calendar_id,
-                timeMin=time_min.isoformat() + 'Z',
-                timeMax=time_max.isoformat() + 'Z',
+                timeMin=from_epoch(start),
+                timeMax=from_epoch(end),
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy='startTime'
             ).execute()
 
-            events = events_result.get('items', [])
+            events = self._ingest(events_result.get('items', []))
+            complete = 'nextPageToken' not in events_result
+            self._index_events(calendar_id, events, start, end, complete=complete)
+            if complete:
+                self.event_cache.store(calendar_id, start, end, events)
             return events
 
         except HttpError as error:
             print(f'An error occurred: {error}')
             return []
 
+    def refresh_window(
+        self,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_id: str = 'primary'
+    ) -> bool:
+        """Fetch a window in one request and cache it for later listings.
+
+        Args:
+            time_min: Start time
+            time_max: End time
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            True if the whole window fit in one page and was cached
+
+        Raises:
+            HttpError: If the listing fails; background callers report it
+        """
+        start, end = self._epoch(time_min), self._epoch(time_max)
+        events_result = self.service.events().list(
+            calendarId=calendar_id,
+            timeMin=from_epoch(start),
+            timeMax=from_epoch(end),
+            maxResults=2500,
+            singleEvents=True,
+            orderBy='startTime'
+        ).execute()
+
+        events = self._ingest(events_result.get('items', []))
+        complete = 'nextPageToken' not in events_result
+        self._index_events(calendar_id, events, start, end, complete=complete)
+        if complete:
+            self.event_cache.store(calendar_id, start, end, events)
+        return complete
+
+    def iter_events(
+        self,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_id: str = 'primary',
+        fields: Optional[str] = None,
+        page_size: int = 2500
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over every event in a window, one page at a time.
+
+        Args:
+            time_min: Start time
+            time_max: End time
+            calendar_id: Calendar ID (default: primary)
+            fields: Partial-response field mask (must include nextPageToken)
+            page_size: Events requested per page (API maximum: 2500)
+
+        Yields:
+            Event dictionaries in start-time order
+
+        Raises:
+            HttpError: If a page cannot be fetched, so a partial listing is
+                never mistaken for the whole window
+        """
+        time_min = from_epoch(self._epoch(time_min))
+        time_max = from_epoch(self._epoch(time_max))
+        page_token = None
+        while True:
+            events_result = self.service.events().list(
+                calendarId=calendar_id,
+                timeMin=time_min,
+                timeMax=time_max,
+                maxResults=page_size,
+                singleEvents=True,
+                orderBy='startTime',
+                pageToken=page_token,
+                **({'fields': fields} if fields else {})
+            ).execute()
+
+            yield from self._ingest(events_result.get('items', []))
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return
+
     def get_today_events(self, calendar_id: str = 'primary') -> List[Dict[str, Any]]:
-        """Get all events for today.
+        """Get all events for today in the user's timezone.
 
         Args:
             calendar_id: Calendar ID (default: primary)
@@ -112,9 +282,7 @@ class GoogleCalendarClient:
         Returns:
             List of today's events
         """
-        now = datetime.utcnow()
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
+        start_of_day, end_of_day = day_bounds(int(time.time()), self.timezone)
 
         return self.list_events(
             max_results=50,
@@ -132,7 +300,8 @@ class GoogleCalendarClient:
         location: str = '',
         attendees: List[str] = None,
         calendar_id: str = 'primary',
-        timezone: str = 'UTC'
+        timezone: Optional[str] = None,
+        conflict_policy: str = 'allow'
     ) -> Dict[str, Any]:
         """Create a new calendar event.
 
@@ -144,11 +313,30 @@ class GoogleCalendarClient:
             location: Event location
             attendees: List of attendee emails
             calendar_id: Calendar ID (default: primary)
-            timezone: Timezone (default: UTC)
+            timezone: Timezone (default: the user's calendar timezone)
+            conflict_policy: 'allow', 'warn' or 'reject' overlapping busy time.
+                'warn' creates the event anyway and reports the overlaps.
 
         Returns:
-            Created event dictionary
+            Created event dictionary; with 'warn', its ``conflicts`` lists the
+            busy time the slot overlapped before it was created
+
+        Raises:
+            SchedulingConflictError: If conflict_policy is 'reject' and the
+                slot overlaps known busy time
+            ConflictCheckError: If conflict_policy is not 'allow' and the
+                busy time around the slot could not be read
         """
+        self._check_conflict_policy(conflict_policy)
+        timezone = timezone or self.timezone
+        conflicts = []
+        if conflict_policy != 'allow':
+            conflicts = self.find_conflicts(
+                to_epoch(start_time, timezone), to_epoch(end_time, timezone), calendar_id
+            )
+            if conflicts and conflict_policy == 'reject':
+                raise SchedulingConflictError(conflicts)
+
         try:
             event = {
                 'summary': summary,
@@ -167,11 +355,15 @@ class GoogleCalendarClient:
             if attendees:
                 event['attendees'] = [{'email': email} for email in attendees]
 
-            created_event = self.service.events().insert(
+            created_event = normalize_event(self.service.events().insert(
                 calendarId=calendar_id,
                 body=event
-            ).execute()
+            ).execute(), self.timezone)
 
+            self._index_event(calendar_id, created_event)
+            self.event_cache.invalidate(calendar_id, *event_span(created_event))
+            if conflict_policy == 'warn':
+                created_event['conflicts'] = conflicts
             return created_event
 
         except HttpError as error:
@@ -186,7 +378,8 @@ class GoogleCalendarClient:
         end_time: Optional[datetime] = None,
         description: Optional[str] = None,
         calendar_id: str = 'primary',
-        timezone: str = 'UTC'
+        timezone: Optional[str] = None,
+        conflict_policy: str = 'allow'
     ) -> Dict[str, Any]:
         """Update an existing event.
 
@@ -197,11 +390,22 @@ class GoogleCalendarClient:
             end_time: New end time
             description: New description
             calendar_id: Calendar ID (default: primary)
-            timezone: Timezone (default: UTC)
+            timezone: Timezone (default: the user's calendar timezone)
+            conflict_policy: 'allow', 'warn' or 'reject' overlapping busy time.
+                'warn' updates the event anyway and reports the overlaps.
 
         Returns:
-            Updated event dictionary
+            Updated event dictionary; with 'warn', its ``conflicts`` lists the
+            busy time a new slot overlapped before the event was moved
+
+        Raises:
+            SchedulingConflictError: If conflict_policy is 'reject' and the
+                new slot overlaps other known busy time
+            ConflictCheckError: If conflict_policy is not 'allow' and the
+                events around the new slot could not be read
         """
+        self._check_conflict_policy(conflict_policy)
+        timezone = timezone or self.timezone
         try:
             # Get current event
             event = self.service.events().get(
@@ -209,6 +413,24 @@ class GoogleCalendarClient:
                 eventId=event_id
             ).execute()
 
+            old_start, old_end = event_span(event, self.timezone)
+            conflicts = []
+            if conflict_policy != 'allow' and (start_time or end_time):
+                new_start = to_epoch(start_time, timezone) if start_time else old_start
+                new_end = to_epoch(end_time, timezone) if end_time else old_end
+                # Free/busy merges the event into its neighbours' blocks, so
+                # list events instead to be able to leave this one out
+                self._ensure_listed(calendar_id, new_start, new_end)
+                # Tie the event to its current slot so it never conflicts with itself
+                self._index_event(calendar_id, event)
+                conflicts = self.find_conflicts(
+                    new_start, new_end, calendar_id, exclude_event_id=event_id
+                )
+                if conflicts and conflict_policy == 'reject':
+                    raise SchedulingConflictError(conflicts)
+
+            self.event_cache.invalidate(calendar_id, old_start, old_end)
+
             # Update fields
             if summary:
                 event['summary'] = summary
@@ -225,12 +447,16 @@ class GoogleCalendarClient:
                     'timeZone': timezone,
                 }
 
-            updated_event = self.service.events().update(
+            updated_event = normalize_event(self.service.events().update(
                 calendarId=calendar_id,
                 eventId=event_id,
                 body=event
-            ).execute()
+            ).execute(), self.timezone)
 
+            self._index_event(calendar_id, updated_event)
+            self.event_cache.invalidate(calendar_id, *event_span(updated_event))
+            if conflict_policy == 'warn':
+                updated_event['conflicts'] = conflicts
             return updated_event
 
         except HttpError as error:
@@ -252,6 +478,10 @@ class GoogleCalendarClient:
                 calendarId=calendar_id,
                 eventId=event_id
             ).execute()
+            if not self._busy_index(calendar_id).remove_event(event_id):
+                # Its time may be held by an anonymous free/busy block
+                self._busy_indexes.pop(calendar_id, None)
+            self.event_cache.invalidate(calendar_id)
             return True
 
         except HttpError as error:
@@ -283,7 +513,7 @@ class GoogleCalendarClient:
                 orderBy='startTime'
             ).execute()
 
-            return events_result.get('items', [])
+            return self._ingest(events_result.get('items', []))
 
         except HttpError as error:
             print(f'An error occurred: {error}')
@@ -309,15 +539,570 @@ class GoogleCalendarClient:
             calendars = ['primary']
 
         try:
-            body = {
-                'timeMin': time_min.isoformat() + 'Z',
-                'timeMax': time_max.isoformat() + 'Z',
-                'items': [{'id': cal_id} for cal_id in calendars]
-            }
-
-            result = self.service.freebusy().query(body=body).execute()
-            return result
+            return self._query_free_busy(self._epoch(time_min), self._epoch(time_max), calendars)
 
         except HttpError as error:
             print(f'An error occurred: {error}')
             return {}
+
+    def _query_free_busy(self, window_start: int, window_end: int, calendars: List[str]) -> Dict[str, Any]:
+        """Query free/busy and index the calendars that answered.
+
+        Raises:
+            HttpError: If the query fails
+        """
+        body = {
+            'timeMin': from_epoch(window_start),
+            'timeMax': from_epoch(window_end),
+            'items': [{'id': cal_id} for cal_id in calendars]
+        }
+
+        result = self.service.freebusy().query(body=body).execute()
+
+        for cal_id, info in result.get('calendars', {}).items():
+            if info.get('errors'):
+                continue
+            index = self._busy_index(cal_id)
+            index.replace_window(window_start, window_end, [
+                (to_epoch(period['start']), to_epoch(period['end']))
+                for period in info.get('busy', [])
+            ])
+            index.mark_covered(window_start, window_end)
+
+        return result
+
+    def import_ics(
+        self,
+        path: str,
+        calendar_id: str = 'primary',
+        timezone: Optional[str] = None,
+        batch_size: int = 50
+    ) -> Dict[str, Any]:
+        """Import events from an .ics file.
+
+        The file is parsed one VEVENT at a time and uploaded in batch
+        requests; the next batch is parsed while the previous one is in
+        flight. Event IDs are derived from each UID, so an interrupted import
+        can simply be run again: events already uploaded are skipped.
+
+        Args:
+            path: Path to the .ics file
+            calendar_id: Calendar ID (default: primary)
+            timezone: Zone for floating times and unknown TZIDs
+                (default: the user's calendar timezone)
+            batch_size: Events per batch request (API maximum: 1000)
+
+        Returns:
+            Counts of ``imported``, ``skipped`` (already present) and
+            ``failed`` events, plus the first few ``errors`` (including
+            series whose modified occurrences could not be hidden). Events that
+            cannot be parsed, or whose batch request fails as a whole, are
+            counted as failed and the rest of the file is still imported.
+        """
+        timezone = timezone or self.timezone
+        summary = {'imported': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+        # Modified instances hide their original occurrence in the series
+        exclusions: Dict[str, List[str]] = {}
+        # Series defined in this file; exported instances may have none
+        masters = set()
+
+        def fail(label, error, count=1):
+            summary['failed'] += count
+            if len(summary['errors']) < 5:
+                summary['errors'].append(f'{label}: {error}')
+
+        def on_response(request_id, response, exception):
+            if exception is None:
+                summary['imported'] += 1
+            elif isinstance(exception, HttpError) and exception.resp.status == 409:
+                summary['skipped'] += 1
+            else:
+                fail(request_id, exception)
+
+        def wait(execute, count):
+            # A failed batch request reports no per-event responses
+            try:
+                execute()
+            except HttpError as error:
+                fail(f'batch of {count} event(s)', error, count)
+
+        with open(path, encoding='utf-8') as fh, ThreadPoolExecutor(max_workers=1) as uploader:
+            in_flight = None
+            batch = self.service.new_batch_http_request(callback=on_response)
+            pending = 0
+
+            for properties in ics.iter_vevents(fh):
+                try:
+                    exclusion = ics.recurrence_exclusion(properties, timezone)
+                    event = ics.vevent_to_event(properties, timezone)
+                except (ValueError, KeyError) as error:
+                    uid = next((value for name, _, value in properties if name == 'UID'), 'VEVENT')
+                    fail(uid, f'could not parse event: {error}')
+                    continue
+
+                if exclusion is not None:
+                    exclusions.setdefault(exclusion[0], []).append(exclusion[1])
+                if event is None or event.get('status') == 'cancelled':
+                    continue
+                if event.get('recurrence'):
+                    masters.add(event['id'])
+
+                batch.add(
+                    self.service.events().insert(calendarId=calendar_id, body=event),
+                    request_id=event['id']
+                )
+                pending += 1
+                if pending >= batch_size:
+                    if in_flight is not None:
+                        wait(in_flight.result, batch_size)
+                    in_flight = uploader.submit(batch.execute)
+                    batch = self.service.new_batch_http_request(callback=on_response)
+                    pending = 0
+
+            if in_flight is not None:
+                wait(in_flight.result, batch_size)
+            if pending:
+                wait(batch.execute, pending)
+
+        for uid, exdates in exclusions.items():
+            if ics.event_key(uid) in masters:
+                try:
+                    self._exclude_instances(calendar_id, ics.event_key(uid), exdates)
+                except HttpError as error:
+                    # The series is in, but still shows the modified occurrences
+                    if len(summary['errors']) < 5:
+                        summary['errors'].append(f'{uid}: could not hide modified instances: {error}')
+
+        self._busy_indexes.pop(calendar_id, None)
+        self.event_cache.invalidate(calendar_id)
+        return summary
+
+    def export_ics(
+        self,
+        path: str,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_id: str = 'primary'
+    ) -> int:
+        """Export events in a window to an .ics file.
+
+        Pages are written as they arrive, so the calendar is never held in
+        memory as a whole. Recurring events are exported as single instances.
+
+        Args:
+            path: Path of the .ics file to write
+            time_min: Start time
+            time_max: End time
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            Number of events written
+
+        Raises:
+            HttpError: If a page cannot be fetched; the file then holds only
+                the events written before the failure
+        """
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            return ics.write_calendar(
+                fh,
+                self.iter_events(time_min, time_max, calendar_id=calendar_id),
+                name=calendar_id
+            )
+
+    def _exclude_instances(self, calendar_id: str, event_id: str, exdates: List[str]):
+        """Add EXDATE lines to an imported recurring event.
+
+        Raises:
+            HttpError: If the event cannot be read or patched
+        """
+        event = self.service.events().get(
+            calendarId=calendar_id,
+            eventId=event_id
+        ).execute()
+        recurrence = event.get('recurrence', [])
+        missing = [line for line in exdates if line not in recurrence]
+        if not recurrence or not missing:
+            return
+        self.service.events().patch(
+            calendarId=calendar_id,
+            eventId=event_id,
+            body={'recurrence': recurrence + missing}
+        ).execute()
+
+    def find_conflicts(
+        self,
+        start_time: Any,
+        end_time: Any,
+        calendar_id: str = 'primary',
+        exclude_event_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Find known busy time overlapping a slot.
+
+        Uses the local busy index; the surrounding days are fetched with a
+        single free/busy query only if they have not been seen recently.
+
+        Args:
+            start_time: Slot start (datetime, ISO string or epoch seconds)
+            end_time: Slot end (datetime, ISO string or epoch seconds)
+            calendar_id: Calendar ID (default: primary)
+            exclude_event_id: Event to ignore, e.g. the one being moved
+
+        Returns:
+            List of conflicting intervals with local ISO ``start``/``end``,
+            ``event_id`` (None for free/busy blocks) and ``summary``
+
+        Raises:
+            ConflictCheckError: If the busy time around the slot could not be read
+        """
+        start, end = self._epoch(start_time), self._epoch(end_time)
+        self._ensure_indexed(calendar_id, start, end)
+        return self._localize_conflicts(
+            self._busy_index(calendar_id).conflicts(start, end, exclude_event_id)
+        )
+
+    def validate_schedule(
+        self,
+        proposed: List[Dict[str, Any]],
+        calendar_id: str = 'primary'
+    ) -> List[Dict[str, Any]]:
+        """Check proposed events against each other and the calendar.
+
+        The whole span of the proposal is fetched with at most one free/busy
+        query, then every event is checked locally.
+
+        Args:
+            proposed: Dicts with ``start_time``, ``end_time`` and optional ``summary``
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            One dict per proposed event, in input order, with ``summary``,
+            ``start``, ``end``, ``calendar_conflicts`` and ``batch_conflicts``
+            (indexes of other proposed events it overlaps)
+
+        Raises:
+            ConflictCheckError: If the calendar's busy time could not be read
+        """
+        if not proposed:
+            return []
+
+        intervals = [
+            (self._epoch(item['start_time']), self._epoch(item['end_time']))
+            for item in proposed
+        ]
+        self._ensure_indexed(
+            calendar_id,
+            min(start for start, _ in intervals),
+            max(end for _, end in intervals)
+        )
+
+        index = self._busy_index(calendar_id)
+        batch_conflicts = find_batch_conflicts(intervals)
+        results = []
+        for item, (start, end), overlaps in zip(proposed, intervals, batch_conflicts):
+            results.append({
+                'summary': item.get('summary', ''),
+                'start': format_local(start, self.timezone),
+                'end': format_local(end, self.timezone),
+                'calendar_conflicts': self._localize_conflicts(index.conflicts(start, end)),
+                'batch_conflicts': overlaps,
+            })
+        return results
+
+    def schedule_meetings(
+        self,
+        meetings: List[Dict[str, Any]],
+        time_min: datetime,
+        time_max: datetime,
+        calendar_id: str = 'primary',
+        work_hours: Tuple[int, int] = (9, 17),
+        include_weekends: bool = False,
+        organizer_attends: bool = True,
+        step_minutes: int = 15,
+        time_limit: float = 2.0,
+        book: bool = False
+    ) -> Dict[str, Any]:
+        """Plan a batch of meetings into attendees' free time.
+
+        Every attendee's free/busy is fetched in one query (per 50
+        attendees, the API's limit), then the plan is solved locally.
+
+        Args:
+            meetings: Dicts with ``summary``, ``duration_minutes`` and optional
+                ``required_attendees``, ``optional_attendees``, ``windows``
+                (list of ``(start, end)`` datetimes), ``buffer_minutes``,
+                ``priority``, ``description`` and ``location``
+            time_min: Earliest start
+            time_max: Latest end
+            calendar_id: Calendar the meetings are booked in (default: primary)
+            work_hours: Local ``(start hour, end hour)`` for meetings without windows
+            include_weekends: Allow meetings without windows on weekends
+            organizer_attends: Also require the calendar owner to be free
+            step_minutes: Granularity of start times
+            time_limit: Seconds the solver may search
+            book: Create the planned events in one batch request and send
+                invitations. Nothing is booked if a free/busy query fails or
+                the calendar owner's free/busy is unknown.
+
+        Returns:
+            The solver's ``scheduled``, ``unscheduled`` and ``stats``, with
+            each entry's ``summary`` and local ``start``/``end`` added, plus
+            ``unknown_attendees`` whose free/busy could not be read (treated
+            as free) and, when
+            booking, ``booked`` events and booking ``errors``
+        """
+        timezone = self.timezone
+        window_start, window_end = self._epoch(time_min), self._epoch(time_max)
+
+        requests = []
+        for meeting in meetings:
+            required = list(meeting.get('required_attendees', []))
+            if organizer_attends:
+                required.insert(0, calendar_id)
+            windows = meeting.get('windows')
+            if windows is not None:
+                windows = [(self._epoch(start), self._epoch(end)) for start, end in windows]
+            else:
+                windows = self._work_windows(
+                    window_start, window_end, work_hours, include_weekends
+                )
+            requests.append(MeetingRequest(
+                meeting['summary'],
+                int(meeting['duration_minutes'] * 60),
+                required=required,
+                optional=meeting.get('optional_attendees', []),
+                windows=windows,
+                buffer=int(meeting.get('buffer_minutes', 0) * 60),
+                priority=meeting.get('priority', 1),
+                description=meeting.get('description', ''),
+                location=meeting.get('location', '')
+            ))
+
+        # Busy periods may start before the window when buffers reach past it
+        max_buffer = max((request.buffer for request in requests), default=0)
+        attendees = list(dict.fromkeys(
+            attendee for request in requests
+            for attendee in request.required + request.optional
+        ))
+        busy: Dict[str, List[Tuple[int, int]]] = {}
+        unknown = []
+        query_errors = []
+        for i in range(0, len(attendees), FREEBUSY_MAX_ITEMS):
+            chunk = attendees[i:i + FREEBUSY_MAX_ITEMS]
+            try:
+                result = self._query_free_busy(
+                    window_start - max_buffer, window_end + max_buffer, chunk
+                )
+            except HttpError as error:
+                query_errors.append(str(error))
+                result = {}
+            calendars = result.get('calendars', {})
+            for attendee in chunk:
+                info = calendars.get(attendee)
+                if info is None or info.get('errors'):
+                    unknown.append(attendee)
+                    continue
+                busy[attendee] = [
+                    (to_epoch(period['start']), to_epoch(period['end']))
+                    for period in info.get('busy', [])
+                ]
+
+        solver = MeetingSolver(
+            window_start, window_end, busy,
+            step=step_minutes * 60, max_buffer=max_buffer
+        )
+        plan = solver.solve(requests, time_limit=time_limit)
+        plan['unknown_attendees'] = unknown
+
+        for item in plan['scheduled'] + plan['unscheduled']:
+            item['summary'] = requests[item['index']].summary
+        for item in plan['scheduled']:
+            item['start_epoch'], item['end_epoch'] = item['start'], item['end']
+            item['start'] = format_local(item['start'], timezone)
+            item['end'] = format_local(item['end'], timezone)
+
+        if book and plan['scheduled']:
+            # Booking on guessed free time could double-book everyone
+            if query_errors or calendar_id in unknown:
+                plan['booked'] = []
+                plan['errors'] = [
+                    f'nothing booked, free/busy could not be read: {error}'
+                    for error in query_errors or [calendar_id]
+                ]
+            else:
+                plan['booked'], plan['errors'] = self._book_plan(
+                    requests, plan['scheduled'], calendar_id
+                )
+        return plan
+
+    def _work_windows(
+        self,
+        start: int,
+        end: int,
+        work_hours: Tuple[int, int],
+        include_weekends: bool
+    ) -> List[Tuple[int, int]]:
+        """Epoch working-hour ranges of each local day overlapping ``[start, end)``."""
+        windows = []
+        first, last = local_date(start, self.timezone), local_date(max(start, end - 1), self.timezone)
+        for offset in range((last - first).days + 1):
+            day = first + timedelta(days=offset)
+            if day.weekday() >= 5 and not include_weekends:
+                continue
+            opens = to_epoch(datetime(day.year, day.month, day.day, work_hours[0]), self.timezone)
+            closes = to_epoch(datetime(day.year, day.month, day.day, work_hours[1]), self.timezone)
+            if min(closes, end) > max(opens, start):
+                windows.append((max(opens, start), min(closes, end)))
+        return windows
+
+    def _book_plan(
+        self,
+        requests: List[MeetingRequest],
+        scheduled: List[Dict[str, Any]],
+        calendar_id: str
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Create planned meetings in one batch request, inviting their attendees."""
+        timezone = self.timezone
+        booked, errors = [], []
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                errors.append(f'{request_id}: {exception}')
+                return
+            event = normalize_event(response, timezone)
+            self._index_event(calendar_id, event)
+            booked.append(event)
+
+        batch = self.service.new_batch_http_request(callback=on_response)
+        for item in scheduled:
+            request = requests[item['index']]
+            attendees = [
+                {'email': email} for email in request.required if email != calendar_id
+            ] + [{'email': email, 'optional': True} for email in item['optional']]
+            event = {
+                'summary': request.summary,
+                'location': request.location,
+                'description': request.description,
+                'start': {'dateTime': item['start'], 'timeZone': timezone},
+                'end': {'dateTime': item['end'], 'timeZone': timezone},
+            }
+            if attendees:
+                event['attendees'] = attendees
+            batch.add(
+                self.service.events().insert(
+                    calendarId=calendar_id, body=event, sendUpdates='all'
+                ),
+                request_id=str(item['index'])
+            )
+
+        try:
+            batch.execute()
+        except HttpError as error:
+            errors.append(str(error))
+
+        starts = [item['start_epoch'] for item in scheduled]
+        ends = [item['end_epoch'] for item in scheduled]
+        self.event_cache.invalidate(calendar_id, min(starts), max(ends))
+        return booked, errors
+
+    def _localize_conflicts(self, conflicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format conflict epochs as local ISO strings."""
+        for conflict in conflicts:
+            conflict['start'] = format_local(conflict['start'], self.timezone)
+            conflict['end'] = format_local(conflict['end'], self.timezone)
+        return conflicts
+
+    def _busy_index(self, calendar_id: str) -> BusyIndex:
+        """Get or create the busy index for a calendar."""
+        if calendar_id not in self._busy_indexes:
+            self._busy_indexes[calendar_id] = BusyIndex()
+        return self._busy_indexes[calendar_id]
+
+    def _ensure_indexed(self, calendar_id: str, start: int, end: int):
+        """Fetch free/busy for whole local days around a window if not covered.
+
+        Raises:
+            ConflictCheckError: If the query fails or the calendar reports errors
+        """
+        if self._busy_index(calendar_id).is_covered(start, end):
+            return
+        window_start, _ = day_bounds(start, self.timezone)
+        _, window_end = day_bounds(max(start, end - 1), self.timezone)
+        try:
+            result = self._query_free_busy(window_start, window_end, [calendar_id])
+        except HttpError as error:
+            raise ConflictCheckError(f'Could not read free/busy for {calendar_id}: {error}') from error
+        if not self._busy_index(calendar_id).is_covered(start, end):
+            errors = result.get('calendars', {}).get(calendar_id, {}).get('errors')
+            raise ConflictCheckError(f'Could not read free/busy for {calendar_id}: {errors}')
+
+    def _ensure_listed(self, calendar_id: str, start: int, end: int):
+        """List events for whole local days around a window if not indexed by ID.
+
+        Raises:
+            ConflictCheckError: If the listing fails
+        """
+        if self._busy_index(calendar_id).is_covered(start, end, listed=True):
+            return
+        window_start, _ = day_bounds(start, self.timezone)
+        _, window_end = day_bounds(max(start, end - 1), self.timezone)
+        events = []
+        page_token = None
+        while True:
+            try:
+                events_result = self.service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=from_epoch(window_start),
+                    timeMax=from_epoch(window_end),
+                    maxResults=2500,
+                    singleEvents=True,
+                    pageToken=page_token
+                ).execute()
+            except HttpError as error:
+                raise ConflictCheckError(f'Could not list events in {calendar_id}: {error}') from error
+            events.extend(self._ingest(events_result.get('items', [])))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+        self._index_events(calendar_id, events, window_start, window_end, complete=True)
+
+    def _index_event(self, calendar_id: str, event: Dict[str, Any]):
+        """Add or refresh a single event in the busy index."""
+        if not event.get('id'):
+            return
+        index = self._busy_index(calendar_id)
+        # All-day, transparent, cancelled and declined events do not block time
+        if ('dateTime' not in event.get('start', {})
+                or event.get('transparency') == 'transparent'
+                or event.get('status') == 'cancelled'
+                or any(attendee.get('self') and attendee.get('responseStatus') == 'declined'
+                       for attendee in event.get('attendees', []))):
+            index.remove_event(event['id'])
+            return
+        start, end = event_span(event, self.timezone)
+        index.add_busy(start, end, event['id'], event.get('summary', ''))
+
+    def _index_events(
+        self,
+        calendar_id: str,
+        events: List[Dict[str, Any]],
+        start: int,
+        end: int,
+        complete: bool
+    ):
+        """Index listed events, marking the window covered if nothing was cut off."""
+        index = self._busy_index(calendar_id)
+        if complete:
+            index.clear_window(start, end)
+        for event in events:
+            self._index_event(calendar_id, event)
+        if complete:
+            index.mark_covered(start, end, listed=True)
+
+    @staticmethod
+    def _check_conflict_policy(conflict_policy: str):
+        """Validate a conflict policy name."""
+        if conflict_policy not in CONFLICT_POLICIES:
+            raise ValueError(
+                f"Invalid conflict_policy: {conflict_policy!r} "
+                f"(expected one of {', '.join(CONFLICT_POLICIES)})"
+            )
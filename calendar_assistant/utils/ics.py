@@ -0,0 +1,390 @@
+"""Streaming iCalendar (.ics) reading and writing.
+
+Files are processed one VEVENT at a time, so importing or exporting a
+calendar takes constant memory regardless of its size.
+"""
+
+import base64
+import hashlib
+import re
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, TextIO
+
+from .timezones import event_span, is_valid_zone, to_epoch
+
+# Windows zone names used by Outlook/Exchange exports
+WINDOWS_TIMEZONES = {
+    'UTC': 'UTC',
+    'GMT Standard Time': 'Europe/London',
+    'Greenwich Standard Time': 'Atlantic/Reykjavik',
+    'W. Europe Standard Time': 'Europe/Berlin',
+    'Romance Standard Time': 'Europe/Paris',
+    'Central Europe Standard Time': 'Europe/Budapest',
+    'Central European Standard Time': 'Europe/Warsaw',
+    'E. Europe Standard Time': 'Europe/Chisinau',
+    'FLE Standard Time': 'Europe/Kiev',
+    'GTB Standard Time': 'Europe/Bucharest',
+    'Russian Standard Time': 'Europe/Moscow',
+    'Israel Standard Time': 'Asia/Jerusalem',
+    'Arabian Standard Time': 'Asia/Dubai',
+    'India Standard Time': 'Asia/Kolkata',
+    'China Standard Time': 'Asia/Shanghai',
+    'Singapore Standard Time': 'Asia/Singapore',
+    'Tokyo Standard Time': 'Asia/Tokyo',
+    'Korea Standard Time': 'Asia/Seoul',
+    'AUS Eastern Standard Time': 'Australia/Sydney',
+    'New Zealand Standard Time': 'Pacific/Auckland',
+    'Hawaiian Standard Time': 'Pacific/Honolulu',
+    'Alaskan Standard Time': 'America/Anchorage',
+    'Pacific Standard Time': 'America/Los_Angeles',
+    'Mountain Standard Time': 'America/Denver',
+    'US Mountain Standard Time': 'America/Phoenix',
+    'Central Standard Time': 'America/Chicago',
+    'Eastern Standard Time': 'America/New_York',
+    'Atlantic Standard Time': 'America/Halifax',
+    'SA Eastern Standard Time': 'America/Cayenne',
+    'E. South America Standard Time': 'America/Sao_Paulo',
+}
+
+_DURATION = re.compile(
+    r'^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+
+
+def map_timezone(tzid: Optional[str], default: str = 'UTC') -> str:
+    """Map an iCalendar TZID to an IANA zone name Google accepts.
+
+    Handles IANA names, Windows names and vendor-prefixed IDs such as
+    ``/mozilla.org/20050126_1/America/New_York``.
+    """
+    if not tzid:
+        return default
+    tzid = tzid.strip('"')
+    if tzid in WINDOWS_TIMEZONES:
+        return WINDOWS_TIMEZONES[tzid]
+    parts = tzid.strip('/').split('/')
+    for i in range(len(parts)):
+        candidate = '/'.join(parts[i:])
+        if is_valid_zone(candidate):
+            return candidate
+    return default
+
+
+def event_key(uid: str, recurrence_id: str = '') -> str:
+    """Deterministic Google event ID for an iCalendar UID.
+
+    Event IDs must be base32hex, so re-importing the same file inserts the
+    same IDs and already-imported events are rejected as duplicates.
+    """
+    digest = hashlib.sha1(f'{uid}\n{recurrence_id}'.encode('utf-8')).digest()
+    return base64.b32hexencode(digest).decode('ascii').rstrip('=').lower()
+
+
+def _parse_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """Split a content line into name, parameters and value."""
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ':' and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        head, value = line, ''
+
+    name, *raw_params = head.split(';')
+    params = {}
+    for param in raw_params:
+        key, _, param_value = param.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded continuation lines."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def iter_vevents(lines: Iterable[str]) -> Iterator[List[Tuple[str, Dict[str, str], str]]]:
+    """Yield the properties of each VEVENT in an iCalendar stream.
+
+    Nested components (e.g. VALARM) are skipped.
+
+    Args:
+        lines: Lines of an .ics file, e.g. an open file object
+
+    Yields:
+        List of ``(name, params, value)`` tuples per VEVENT
+    """
+    properties = None
+    depth = 0
+    for line in _unfold(lines):
+        name, params, value = _parse_line(line)
+        if name == 'BEGIN':
+            if value.upper() == 'VEVENT' and properties is None:
+                properties = []
+                depth = 0
+            elif properties is not None:
+                depth += 1
+        elif name == 'END' and properties is not None:
+            if depth:
+                depth -= 1
+            elif value.upper() == 'VEVENT':
+                yield properties
+                properties = None
+        elif properties is not None and not depth:
+            properties.append((name, params, value))
+
+
+def _unescape(value: str) -> str:
+    return re.sub(
+        r'\\([\\;,nN])',
+        lambda m: '\n' if m.group(1) in 'nN' else m.group(1),
+        value
+    )
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace('\\', '\\\\').replace(';', '\\;')
+        .replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def _parse_duration(value: str) -> timedelta:
+    match = _DURATION.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid DURATION: {value}")
+    parts = {k: int(v) for k, v in match.groupdict().items() if v and k != 'sign'}
+    delta = timedelta(**parts)
+    return -delta if match.group('sign') == '-' else delta
+
+
+def _parse_time(
+    params: Dict[str, str],
+    value: str,
+    default_tz: str
+) -> Tuple[Dict[str, str], datetime]:
+    """Convert a DTSTART/DTEND value to a Google time dict and a naive datetime."""
+    # Some producers write ISO 8601 separators (2024-01-05, 2024-01-05T09:00:00Z)
+    value = value.replace('-', '').replace(':', '')
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        day = datetime.strptime(value[:8], '%Y%m%d')
+        return {'date': day.strftime('%Y-%m-%d')}, day
+
+    moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    if value.endswith('Z'):
+        return {'dateTime': moment.isoformat() + 'Z'}, moment
+    return {
+        'dateTime': moment.isoformat(),
+        'timeZone': map_timezone(params.get('TZID'), default_tz),
+    }, moment
+
+
+def _format_time(moment: datetime, like: Dict[str, str]) -> Dict[str, str]:
+    """Format a naive datetime the same way as another Google time dict."""
+    if 'date' in like:
+        return {'date': moment.strftime('%Y-%m-%d')}
+    if like['dateTime'].endswith('Z'):
+        return {'dateTime': moment.isoformat() + 'Z'}
+    return {'dateTime': moment.isoformat(), 'timeZone': like['timeZone']}
+
+
+def vevent_to_event(
+    properties: List[Tuple[str, Dict[str, str], str]],
+    default_tz: str = 'UTC'
+) -> Optional[Dict[str, Any]]:
+    """Convert VEVENT properties to a Google Calendar event body.
+
+    The returned body carries a deterministic ``id`` derived from UID and
+    RECURRENCE-ID. Events without DTSTART are skipped (None is returned);
+    cancelled instances come back with ``status`` set to ``cancelled``.
+
+    Args:
+        properties: Output of ``iter_vevents`` for one event
+        default_tz: Zone for floating times and unknown TZIDs
+    """
+    event: Dict[str, Any] = {}
+    uid = ''
+    recurrence_id = ''
+    start = end = duration = None
+    recurrence = []
+    attendees = []
+
+    for name, params, value in properties:
+        if name == 'UID':
+            uid = value
+        elif name == 'SUMMARY':
+            event['summary'] = _unescape(value)
+        elif name == 'DESCRIPTION':
+            event['description'] = _unescape(value)
+        elif name == 'LOCATION':
+            event['location'] = _unescape(value)
+        elif name == 'STATUS' and value.upper() in ('TENTATIVE', 'CANCELLED'):
+            event['status'] = value.lower()
+        elif name == 'TRANSP' and value.upper() == 'TRANSPARENT':
+            event['transparency'] = 'transparent'
+        elif name == 'DTSTART':
+            start = _parse_time(params, value, default_tz)
+        elif name == 'DTEND':
+            end = _parse_time(params, value, default_tz)
+        elif name == 'DURATION':
+            duration = _parse_duration(value)
+        elif name == 'RECURRENCE-ID':
+            recurrence_id = value
+        elif name in ('RRULE', 'RDATE', 'EXDATE', 'EXRULE'):
+            line = name
+            for key, param_value in params.items():
+                if key == 'TZID':
+                    param_value = map_timezone(param_value, default_tz)
+                line += f';{key}={param_value}'
+            recurrence.append(f'{line}:{value}')
+        elif name == 'ATTENDEE' and value.lower().startswith('mailto:'):
+            attendee = {'email': value[len('mailto:'):]}
+            if params.get('CN'):
+                attendee['displayName'] = params['CN']
+            if params.get('ROLE') == 'OPT-PARTICIPANT':
+                attendee['optional'] = True
+            attendees.append(attendee)
+
+    if start is None:
+        return None
+
+    event['start'] = start[0]
+    if end is not None:
+        event['end'] = end[0]
+    else:
+        # RFC 5545: no DTEND means DURATION, or one day / zero length
+        if duration is None:
+            duration = timedelta(days=1) if 'date' in start[0] else timedelta(0)
+        event['end'] = _format_time(start[1] + duration, start[0])
+
+    if recurrence and not recurrence_id:
+        event['recurrence'] = recurrence
+        # Google needs a zone to expand recurring timed events
+        for field in ('start', 'end'):
+            if 'dateTime' in event[field]:
+                event[field].setdefault('timeZone', 'UTC')
+    if attendees:
+        event['attendees'] = attendees
+    event['id'] = event_key(uid or repr(properties), recurrence_id)
+    return event
+
+
+def recurrence_exclusion(
+    properties: List[Tuple[str, Dict[str, str], str]],
+    default_tz: str = 'UTC'
+) -> Optional[Tuple[str, str]]:
+    """For a modified instance, return ``(uid, EXDATE line)`` hiding the original.
+
+    Returns None for events that do not override a recurring instance.
+    """
+    uid = None
+    exdate = None
+    for name, params, value in properties:
+        if name == 'UID':
+            uid = value
+        elif name == 'RECURRENCE-ID':
+            if params.get('VALUE') == 'DATE' or len(value) == 8:
+                exdate = f'EXDATE;VALUE=DATE:{value[:8]}'
+            elif 'TZID' in params:
+                exdate = f"EXDATE;TZID={map_timezone(params['TZID'], default_tz)}:{value}"
+            else:
+                exdate = f'EXDATE:{value}'
+    if uid is None or exdate is None:
+        return None
+    return uid, exdate
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    chunks = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split inside a UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def _ics_stamp(epoch: int) -> str:
+    return time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(epoch))
+
+
+def write_vevent(fh: TextIO, event: Dict[str, Any], stamp: str):
+    """Write one Google Calendar event as a VEVENT.
+
+    Instances of a recurring series share the series' UID, so they are
+    written with a RECURRENCE-ID from their original start time.
+    """
+    lines = ['BEGIN:VEVENT', f"UID:{event.get('iCalUID') or event.get('id', '')}", f'DTSTAMP:{stamp}']
+    span = event_span(event)
+    for field, name, epoch in (('start', 'DTSTART', span[0]), ('end', 'DTEND', span[1])):
+        value = event.get(field, {})
+        if value.get('date'):
+            lines.append(f"{name};VALUE=DATE:{value['date'].replace('-', '')}")
+        elif value.get('dateTime'):
+            lines.append(f'{name}:{_ics_stamp(epoch)}')
+    original = event.get('originalStartTime') if event.get('recurringEventId') else None
+    if original and original.get('date'):
+        lines.append(f"RECURRENCE-ID;VALUE=DATE:{original['date'].replace('-', '')}")
+    elif original and original.get('dateTime'):
+        zone = original.get('timeZone') or 'UTC'
+        lines.append(f"RECURRENCE-ID:{_ics_stamp(to_epoch(original['dateTime'], zone))}")
+    for field, name in (('summary', 'SUMMARY'), ('description', 'DESCRIPTION'), ('location', 'LOCATION')):
+        if event.get(field):
+            lines.append(f'{name}:{_escape(event[field])}')
+    if event.get('status') == 'tentative':
+        lines.append('STATUS:TENTATIVE')
+    if event.get('transparency') == 'transparent':
+        lines.append('TRANSP:TRANSPARENT')
+    lines.extend(event.get('recurrence', []))
+    for attendee in event.get('attendees', []):
+        if attendee.get('email'):
+            params = ''
+            if attendee.get('displayName'):
+                params += f";CN=\"{attendee['displayName']}\""
+            if attendee.get('optional'):
+                params += ';ROLE=OPT-PARTICIPANT'
+            lines.append(f"ATTENDEE{params}:mailto:{attendee['email']}")
+    lines.append('END:VEVENT')
+    fh.write(''.join(_fold(line) for line in lines))
+
+
+def write_calendar(fh: TextIO, events: Iterable[Dict[str, Any]], name: str = '') -> int:
+    """Write events as a complete VCALENDAR, consuming the iterable lazily.
+
+    Returns:
+        Number of events written
+    """
+    stamp = _ics_stamp(int(time.time()))
+    fh.write(_fold('BEGIN:VCALENDAR'))
+    fh.write(_fold('VERSION:2.0'))
+    fh.write(_fold('PRODID:-//ai-calendar-assistant//EN'))
+    if name:
+        fh.write(_fold(f'X-WR-CALNAME:{_escape(name)}'))
+    count = 0
+    for event in events:
+        write_vevent(fh, event, stamp)
+        count += 1
+    fh.write(_fold('END:VCALENDAR'))
+    return count
@@ -0,0 +1,165 @@
+"""Background warm-up of commonly requested event windows.
+
+"Today", "tomorrow" and "this week" make up most listings, so they are
+fetched at startup, again just after each local midnight, and shortly before
+their cached copies expire. Windows the user actually asked for recently are
+learned from the cache's request log and kept warm the same way, within an
+hourly request budget.
+"""
+
+import asyncio
+import contextlib
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from .timezones import day_bounds, day_start, local_date
+
+# (first day relative to today, number of days): today, tomorrow, upcoming week.
+# The week window runs 8 days so "now + 7 days" fits inside it all day long.
+DEFAULT_WINDOWS = ((0, 1), (1, 1), (0, 8))
+
+# Learned windows longer than this are not worth keeping warm
+MAX_LEARNED_DAYS = 31
+
+
+class Prefetcher:
+    """Keeps the calendar client's event cache warm for predictable windows."""
+
+    def __init__(
+        self,
+        client,
+        timezone: Optional[str] = None,
+        budget_per_hour: int = 60,
+        lead: int = 60,
+        learn_for: int = 7200,
+        calendar_id: str = 'primary'
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            client: GoogleCalendarClient whose event_cache is warmed
+            timezone: IANA timezone whose days define the windows
+                (default: the client's calendar timezone)
+            budget_per_hour: Maximum prefetch requests in any rolling hour
+            lead: Seconds before expiry at which a window is refreshed
+            learn_for: Seconds a requested window keeps being refreshed
+            calendar_id: Calendar to prefetch (default: primary)
+        """
+        self.client = client
+        self.timezone = timezone or client.timezone
+        self.budget_per_hour = budget_per_hour
+        self.lead = lead
+        self.learn_for = learn_for
+        self.calendar_id = calendar_id
+        self.prefetches = 0
+        self._fetch_times = deque()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and prefetch counters for tuning."""
+        cache = self.client.event_cache
+        self._trim_budget()
+        return {
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'hit_rate': round(cache.hit_rate, 3),
+            'prefetches': self.prefetches,
+            'budget_used': len(self._fetch_times),
+            'budget_per_hour': self.budget_per_hour,
+            'windows': [(offset, days) for offset, days in self.planned_windows()],
+        }
+
+    def planned_windows(self) -> List[Tuple[int, int]]:
+        """Default and learned ``(day offset, days)`` windows, widest first.
+
+        Windows contained in a wider planned window are dropped, since
+        fetching the wider one serves them too.
+        """
+        today = self._today()
+        shapes = set(DEFAULT_WINDOWS)
+        cutoff = time.time() - self.learn_for
+        for calendar_id, start, end, requested_at in list(self.client.event_cache.requests):
+            if calendar_id != self.calendar_id or requested_at < cutoff:
+                continue
+            first = local_date(start, self.timezone)
+            last = local_date(max(start, end - 1), self.timezone)
+            offset = (first - today).days
+            days = (last - first).days + 1
+            if offset >= -1 and days <= MAX_LEARNED_DAYS:
+                shapes.add((offset, days))
+
+        planned = []
+        for offset, days in sorted(shapes, key=lambda s: (-s[1], s[0])):
+            if not any(o <= offset and o + d >= offset + days for o, d in planned):
+                planned.append((offset, days))
+        return planned
+
+    def refresh_due(self) -> int:
+        """Fetch planned windows that are missing or about to expire.
+
+        Returns:
+            Number of windows fetched
+        """
+        cache = self.client.event_cache
+        fetched = 0
+        for offset, days in self.planned_windows():
+            start, end = self._window(offset, days)
+            age = cache.age(self.calendar_id, start, end)
+            if age is not None and age < cache.ttl - self.lead:
+                continue
+
+            self._trim_budget()
+            if len(self._fetch_times) >= self.budget_per_hour:
+                break
+
+            self._fetch_times.append(time.monotonic())
+            self.prefetches += 1
+            if self.client.refresh_window(
+                datetime.fromtimestamp(start, timezone.utc),
+                datetime.fromtimestamp(end, timezone.utc),
+                self.calendar_id
+            ):
+                fetched += 1
+        return fetched
+
+    async def run(self, lock: Optional[asyncio.Lock] = None):
+        """Refresh windows until cancelled.
+
+        Fetches run in a worker thread so the event loop keeps serving
+        requests meanwhile.
+
+        Args:
+            lock: Held around each refresh, so the client is never used by
+                tool calls and the prefetcher at the same time
+        """
+        while True:
+            try:
+                async with lock or contextlib.nullcontext():
+                    await asyncio.to_thread(self.refresh_due)
+            except Exception as error:
+                print(f'Prefetch failed: {error}', file=sys.stderr)
+            await asyncio.sleep(self._seconds_until_next_check())
+
+    def _today(self):
+        return local_date(int(time.time()), self.timezone)
+
+    def _window(self, offset: int, days: int) -> Tuple[int, int]:
+        """Epoch bounds of ``days`` local days starting ``offset`` days from today."""
+        first = self._today() + timedelta(days=offset)
+        return (
+            day_start(first, self.timezone),
+            day_start(first + timedelta(days=days), self.timezone)
+        )
+
+    def _seconds_until_next_check(self) -> float:
+        # Check twice per lead period, and right after local midnight
+        now = int(time.time())
+        _, next_midnight = day_bounds(now, self.timezone)
+        return max(1.0, min(self.lead / 2, next_midnight - now + 1))
+
+    def _trim_budget(self):
+        hour_ago = time.monotonic() - 3600
+        while self._fetch_times and self._fetch_times[0] < hour_ago:
+            self._fetch_times.popleft()
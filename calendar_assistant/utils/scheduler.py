@@ -0,0 +1,544 @@
+"""Constraint solver for placing a batch of meetings.
+
+Time between the earliest and latest allowed moment is cut into fixed-size
+slots, and every attendee's busy time becomes one integer bitset over those
+slots. Checking a candidate start against any number of attendees is then a
+handful of big-integer AND/OR operations, and placing a meeting is an OR into
+each attendee's bitset.
+
+Placement is a branch-and-bound search: meetings are taken in priority
+order (fewest remaining candidate starts first among equals), candidate
+starts are tried best-first, and a branch is abandoned as soon as an upper
+bound on what it can still achieve is no better than the best plan found.
+The search stops at a time limit and returns the best plan found so far;
+for batches of more than a few dozen meetings over a small group of
+attendees, that limit is usually reached before the plan is proven best.
+"""
+
+import time
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+DEFAULT_STEP = 900
+
+
+class _Timeout(Exception):
+    pass
+
+
+class MeetingRequest:
+    """A meeting to place, with its attendees and constraints."""
+
+    def __init__(
+        self,
+        summary: str,
+        duration: int,
+        required: Sequence[str] = (),
+        optional: Sequence[str] = (),
+        windows: Optional[List[Tuple[int, int]]] = None,
+        buffer: int = 0,
+        priority: int = 1,
+        description: str = '',
+        location: str = ''
+    ):
+        """Initialize the request.
+
+        Args:
+            summary: Meeting title
+            duration: Length in seconds
+            required: Attendees who must all be free
+            optional: Attendees invited when free, preferred but not required
+            windows: Epoch ``(start, end)`` ranges the meeting must fall in
+                (default: anywhere in the solver's horizon)
+            buffer: Seconds each attendee must also be free before and after.
+                Buffers of neighbouring meetings in the same plan may overlap,
+                so two of them need the larger buffer between them, not the sum
+            priority: Weight of the meeting; higher-priority meetings are
+                placed first and count for more when not all of them fit
+            description: Event description used when booking
+            location: Event location used when booking
+        """
+        if duration <= 0:
+            raise ValueError(f'Meeting {summary!r} needs a positive duration')
+        if priority < 1:
+            raise ValueError(f'Meeting {summary!r} needs a priority of at least 1')
+        self.summary = summary
+        self.duration = duration
+        self.required = list(dict.fromkeys(required))
+        self.optional = [a for a in dict.fromkeys(optional) if a not in self.required]
+        self.windows = windows
+        self.buffer = buffer
+        self.priority = priority
+        self.description = description
+        self.location = location
+
+
+class _Prepared:
+    __slots__ = ('index', 'request', 'slots', 'buffer', 'span', 'starts')
+
+    def __init__(self, index: int, request: MeetingRequest, slots: int, buffer: int, starts: int):
+        self.index = index
+        self.request = request
+        self.slots = slots
+        self.buffer = buffer
+        # Slots that must be free of other busy time: the meeting plus a buffer on each side
+        self.span = slots + 2 * buffer
+        # Bit s set: the meeting may start at slot s as far as windows go
+        self.starts = starts
+
+
+# A pending meeting with its candidate starts and the slots they could block
+_Option = Tuple[_Prepared, int, int]
+
+
+def _runs(mask: int, length: int) -> int:
+    """Bits ``p`` of ``mask`` starting ``length`` consecutive set bits."""
+    covered = 1
+    while covered < length and mask:
+        shift = min(covered, length - covered)
+        mask &= mask >> shift
+        covered += shift
+    return mask
+
+
+def _clashes(hold: Tuple[int, int, int], core: int, block: int) -> bool:
+    """Whether a hold and a meeting overlap, counting either one's buffers
+    but not both."""
+    return bool(hold[1] & block or hold[2] & core)
+
+
+def _bits(mask: int):
+    """Indexes of the set bits of ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class MeetingSolver:
+    """Places meetings into attendees' free time without overlaps."""
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        busy: Dict[str, List[Tuple[int, int]]],
+        step: int = DEFAULT_STEP,
+        max_buffer: int = 0
+    ):
+        """Initialize the solver.
+
+        Args:
+            start: Epoch of the earliest allowed meeting start
+            end: Epoch by which every meeting must end
+            busy: Epoch ``(start, end)`` busy periods per attendee
+            step: Slot size in seconds; meetings start on slot boundaries
+            max_buffer: Largest buffer any meeting will ask for, in seconds
+        """
+        self.step = step
+        self.start = start
+        self.end = end
+        # Pad the grid so buffers of meetings at the horizon edges fit on it
+        pad = -(-max_buffer // step) * step
+        self.origin = (start - pad) // step * step
+        self.size = -(-(end + pad - self.origin) // step)
+        self.full = (1 << self.size) - 1
+        # Busy time, plus the meetings (without buffers) of the current plan
+        self.busy = {
+            attendee: self._cover(periods) for attendee, periods in busy.items()
+        }
+        # Meetings of the current plan with their buffers. Another meeting may
+        # not overlap these, but its own buffer may.
+        self._margin: Dict[str, int] = {}
+        # (meeting index, meeting slots, slots with buffers) held by optional
+        # attendees for meetings in the current plan. A hold gives way when
+        # the attendee is required elsewhere.
+        self._held: Dict[str, List[Tuple[int, int, int]]] = {}
+
+    def _cover(self, periods: List[Tuple[int, int]]) -> int:
+        """Bitset of every slot touched by any of the periods."""
+        mask = 0
+        for start, end in periods:
+            first = max(0, (start - self.origin) // self.step)
+            last = min(self.size, -(-(end - self.origin) // self.step))
+            if last > first:
+                mask |= ((1 << (last - first)) - 1) << first
+        return mask
+
+    def _inside(self, periods: List[Tuple[int, int]]) -> int:
+        """Bitset of the slots lying entirely within any of the periods."""
+        mask = 0
+        for start, end in periods:
+            first = -(-(max(start, self.start) - self.origin) // self.step)
+            last = (min(end, self.end) - self.origin) // self.step
+            if last > first:
+                mask |= ((1 << (last - first)) - 1) << first
+        return mask
+
+    def _prepare(self, index: int, request: MeetingRequest) -> _Prepared:
+        slots = -(-request.duration // self.step)
+        windows = request.windows if request.windows is not None else [(self.start, self.end)]
+        return _Prepared(
+            index,
+            request,
+            slots,
+            -(-request.buffer // self.step),
+            _runs(self._inside(windows), slots)
+        )
+
+    def _fits(self, meeting: _Prepared, blocked: int, margin: int) -> int:
+        """Starts where the meeting and its buffers avoid ``blocked`` and the
+        meeting itself also avoids ``margin``."""
+        free = ~blocked & self.full
+        starts = _runs(free, meeting.span) << meeting.buffer
+        if margin:
+            starts &= _runs(free & ~margin, meeting.slots)
+        return starts
+
+    def _free_starts(self, meeting: _Prepared, attendee: str, holds: bool = True) -> int:
+        """Starts at which an attendee is free for the meeting and its buffers."""
+        blocked = self.busy.get(attendee, 0)
+        margin = self._margin.get(attendee, 0)
+        if holds:
+            for _, core, block in self._held.get(attendee, ()):
+                blocked |= core
+                margin |= block
+        return self._fits(meeting, blocked, margin)
+
+    def _candidates(self, meeting: _Prepared) -> int:
+        blocked = margin = 0
+        for attendee in meeting.request.required:
+            blocked |= self.busy.get(attendee, 0)
+            margin |= self._margin.get(attendee, 0)
+        return self._fits(meeting, blocked, margin) & meeting.starts
+
+    def solve(self, requests: List[MeetingRequest], time_limit: float = 2.0) -> Dict[str, Any]:
+        """Find a conflict-free plan.
+
+        Plans are compared first by the total priority of the meetings they
+        place, then by the number of optional attendees who can come. Among
+        equals, earlier starts are tried first.
+
+        The search runs twice: first for the best priority with required
+        attendees alone, which prunes far better, then with optional
+        attendees, starting from that plan, for whatever time is left.
+
+        Args:
+            requests: Meetings to place
+            time_limit: Seconds to search before returning the best plan found
+
+        Returns:
+            ``scheduled`` meetings (request ``index``, epoch ``start`` and
+            ``end``, and ``optional`` attendees who are free), ``unscheduled``
+            meetings (``index`` and ``reason``), and search ``stats``
+        """
+        started = time.perf_counter()
+        deadline = started + time_limit
+        meetings = [self._prepare(i, request) for i, request in enumerate(requests)]
+        initial = {m.index for m in meetings if self._candidates(m)}
+
+        placed: Dict[int, Tuple[int, List[str]]] = {}
+        best = {'key': None, 'placed': {}}
+        nodes = 0
+        with_optional = False
+
+        def search(remaining: List[_Prepared], priority: int, optional: int):
+            nonlocal nodes
+            nodes += 1
+            if nodes & 63 == 0 and time.perf_counter() > deadline:
+                raise _Timeout()
+
+            # Busy time only grows, so meetings without a start now never get one
+            options = []
+            for meeting in remaining:
+                candidates = self._candidates(meeting)
+                if candidates:
+                    options.append((meeting, candidates, self._footprint(meeting, candidates)))
+
+            # A meeting none of whose starts can touch another pending meeting's
+            # attendees is best placed right away at its own best start
+            isolated, options = self._split_isolated(options, with_optional)
+            undo = []
+            try:
+                for meeting, candidates, _ in isolated:
+                    start, attending, revoked = self._ranked(meeting, candidates, with_optional)[0]
+                    undo.append(self._place(meeting, start, attending, placed))
+                    priority += meeting.request.priority
+                    optional += len(attending) - revoked
+
+                key = (priority, optional)
+                if best['key'] is None or key > best['key']:
+                    best['key'] = key
+                    best['placed'] = dict(placed)
+                if not options:
+                    return
+
+                # Holds can give way later, so only firm busy time bounds this
+                bound = (priority + self._priority_bound(options), optional)
+                if with_optional:
+                    bound = (bound[0], optional + sum(
+                        1 for m, candidates, _ in options for attendee in m.request.optional
+                        if self._free_starts(m, attendee, holds=False) & candidates
+                    ))
+                if bound <= best['key']:
+                    return
+
+                meeting, candidates, _ = max(
+                    options,
+                    key=lambda option: (option[0].request.priority, -bin(option[1]).count('1'))
+                )
+                rest = [m for m, _, _ in options if m is not meeting]
+
+                for start, attending, revoked in self._ranked(meeting, candidates, with_optional):
+                    record = self._place(meeting, start, attending, placed)
+                    search(
+                        rest,
+                        priority + meeting.request.priority,
+                        optional + len(attending) - revoked
+                    )
+                    self._unplace(record, placed)
+                    if best['key'] >= bound:
+                        return
+
+                # Leave this meeting out and place the others
+                search(rest, priority, optional)
+            finally:
+                for record in reversed(undo):
+                    self._unplace(record, placed)
+
+        # A timeout leaves the search's placements applied; start over from a copy
+        saved_busy = dict(self.busy)
+        priority_seconds = None
+        try:
+            search(meetings, 0, 0)
+            priority_seconds = time.perf_counter() - started
+        except _Timeout:
+            pass
+        self.busy, self._margin, self._held = dict(saved_busy), {}, {}
+
+        # Invite optional attendees to the plan found, then try to do better
+        best['key'], best['placed'] = self._invite_optional(meetings, best['placed'])
+        complete = False
+        if priority_seconds is not None:
+            with_optional = True
+            try:
+                search(meetings, 0, 0)
+                complete = True
+            except _Timeout:
+                pass
+        self.busy, self._margin, self._held = saved_busy, {}, {}
+
+        scheduled = []
+        unscheduled = []
+        for meeting in meetings:
+            if meeting.index in best['placed']:
+                slot, attending = best['placed'][meeting.index]
+                start = self.origin + slot * self.step
+                scheduled.append({
+                    'index': meeting.index,
+                    'start': start,
+                    'end': start + meeting.request.duration,
+                    'optional': attending,
+                })
+            else:
+                if meeting.index not in initial:
+                    reason = 'no slot where all required attendees are free'
+                elif priority_seconds is not None:
+                    reason = 'conflicts with other meetings in the plan'
+                else:
+                    reason = 'not placed within the time limit'
+                unscheduled.append({'index': meeting.index, 'reason': reason})
+
+        scheduled.sort(key=lambda item: item['start'])
+        return {
+            'scheduled': scheduled,
+            'unscheduled': unscheduled,
+            'stats': {
+                'meetings': len(meetings),
+                'attendees': len({
+                    attendee for request in requests
+                    for attendee in request.required + request.optional
+                }),
+                'slots': self.size,
+                'nodes': nodes,
+                # Whether the total priority placed is proven best possible
+                'priority_optimal': priority_seconds is not None,
+                'priority_seconds': round(priority_seconds, 4) if priority_seconds is not None else None,
+                # Whether the optional attendance is proven best possible too
+                'complete': complete,
+                'seconds': round(time.perf_counter() - started, 4),
+            },
+        }
+
+    def _ranked(
+        self,
+        meeting: _Prepared,
+        candidates: int,
+        with_optional: bool = True
+    ) -> List[Tuple[int, List[str], int]]:
+        """Candidate starts, best first.
+
+        Returns:
+            ``(start, optional attendees free, optional places given up)``
+            per start, the last counting holds of required attendees that
+            the meeting would overlap
+        """
+        if not with_optional:
+            return [(start, [], 0) for start in _bits(candidates)]
+        free = [
+            (attendee, self._free_starts(meeting, attendee))
+            for attendee in meeting.request.optional
+        ]
+        holds = [
+            hold for attendee in meeting.request.required
+            for hold in self._held.get(attendee, ())
+        ]
+        ranked = []
+        for start in _bits(candidates):
+            bit = 1 << start
+            attending = [attendee for attendee, mask in free if mask & bit]
+            revoked = 0
+            if holds:
+                core, block = self._blocks(meeting, start)
+                revoked = sum(1 for hold in holds if _clashes(hold, core, block))
+            ranked.append((start, attending, revoked))
+        ranked.sort(key=lambda item: (item[2] - len(item[1]), item[0]))
+        return ranked
+
+    @staticmethod
+    def _blocks(meeting: _Prepared, start: int) -> Tuple[int, int]:
+        """Slots of the meeting at ``start``, without and with its buffers."""
+        return (
+            ((1 << meeting.slots) - 1) << start,
+            ((1 << meeting.span) - 1) << (start - meeting.buffer),
+        )
+
+    def _footprint(self, meeting: _Prepared, candidates: int) -> int:
+        """Every slot some start in ``candidates`` would block, buffers included."""
+        covered = 1
+        while covered < meeting.span:
+            shift = min(covered, meeting.span - covered)
+            candidates |= candidates << shift
+            covered += shift
+        return candidates >> meeting.buffer
+
+    @staticmethod
+    def _split_isolated(
+        options: List[_Option],
+        with_optional: bool = True
+    ) -> Tuple[List[_Option], List[_Option]]:
+        """Separate meetings whose placement cannot affect any other."""
+        def attendees(request):
+            return request.required + request.optional if with_optional else request.required
+
+        seen: Dict[str, int] = {}
+        shared: Dict[str, int] = {}
+        for meeting, _, footprint in options:
+            for attendee in attendees(meeting.request):
+                covered = seen.get(attendee, 0)
+                shared[attendee] = shared.get(attendee, 0) | (covered & footprint)
+                seen[attendee] = covered | footprint
+
+        isolated, linked = [], []
+        for option in options:
+            request, footprint = option[0].request, option[2]
+            if any(shared[a] & footprint for a in attendees(request)):
+                linked.append(option)
+            else:
+                isolated.append(option)
+        return isolated, linked
+
+    def _priority_bound(self, options: List[_Option]) -> int:
+        """Upper bound on the total priority of the meetings that can still be placed.
+
+        Meetings sharing a required attendee cannot together need more of
+        that attendee's free slots than there are, so each attendee gives a
+        fractional-knapsack bound on how much priority must be given up.
+        Buffers may overlap each other, so only meeting slots are counted.
+        """
+        total = sum(meeting.request.priority for meeting, _, _ in options)
+        needs: Dict[str, List[Tuple[_Prepared, int]]] = {}
+        for meeting, _, footprint in options:
+            for attendee in meeting.request.required:
+                needs.setdefault(attendee, []).append((meeting, footprint))
+
+        worst = 0
+        for attendee, items in needs.items():
+            if len(items) < 2:
+                continue
+            reach = 0
+            for _, footprint in items:
+                reach |= footprint
+            blocked = self.busy.get(attendee, 0) | self._margin.get(attendee, 0)
+            capacity = bin(reach & ~blocked).count('1')
+            if sum(meeting.slots for meeting, _ in items) <= capacity:
+                continue
+
+            given_up = 0
+            for meeting, _ in sorted(items, key=lambda item: -item[0].request.priority / item[0].slots):
+                if capacity >= meeting.slots:
+                    capacity -= meeting.slots
+                else:
+                    given_up += meeting.request.priority * (1 - capacity / meeting.slots)
+                    capacity = 0
+            worst = max(worst, given_up)
+        # Priorities are whole numbers, so a fractional loss rounds up
+        return total - int(-(-worst // 1))
+
+    def _invite_optional(
+        self,
+        meetings: List[_Prepared],
+        plan: Dict[int, Tuple[int, List[str]]]
+    ) -> Tuple[Tuple[int, int], Dict[int, Tuple[int, List[str]]]]:
+        """Add free optional attendees to a plan, returning its key and the new plan."""
+        placed: Dict[int, Tuple[int, List[str]]] = {}
+        records = []
+        priority = optional = 0
+        for meeting in meetings:
+            if meeting.index not in plan:
+                continue
+            start = plan[meeting.index][0]
+            _, attending, revoked = self._ranked(meeting, 1 << start)[0]
+            records.append(self._place(meeting, start, attending, placed))
+            priority += meeting.request.priority
+            optional += len(attending) - revoked
+        result = dict(placed)
+        for record in reversed(records):
+            self._unplace(record, placed)
+        return (priority, optional), result
+
+    def _place(self, meeting: _Prepared, start: int, attending: List[str], placed: Dict):
+        """Add a meeting to the plan, returning what ``_unplace`` needs to undo it."""
+        core, block = self._blocks(meeting, start)
+        saved_busy, saved_held, saved_placed = [], {}, {}
+        for attendee in meeting.request.required:
+            previous = self.busy.get(attendee, 0)
+            margin = self._margin.get(attendee, 0)
+            saved_busy.append((attendee, previous, margin))
+            self.busy[attendee] = previous | core
+            self._margin[attendee] = margin | block
+
+            # Drop this attendee from optional places they are now needed over
+            held = self._held.get(attendee, [])
+            clashing = [hold[0] for hold in held if _clashes(hold, core, block)]
+            if clashing:
+                saved_held[attendee] = held
+                self._held[attendee] = [hold for hold in held if hold[0] not in clashing]
+                for index in clashing:
+                    saved_placed.setdefault(index, placed[index])
+                    other_start, other_attending = placed[index]
+                    placed[index] = (other_start, [a for a in other_attending if a != attendee])
+        for attendee in attending:
+            held = self._held.get(attendee, [])
+            saved_held[attendee] = held
+            self._held[attendee] = held + [(meeting.index, core, block)]
+        placed[meeting.index] = (start, attending)
+        return meeting.index, saved_busy, saved_held, saved_placed
+
+    def _unplace(self, record, placed: Dict):
+        index, saved_busy, saved_held, saved_placed = record
+        del placed[index]
+        placed.update(saved_placed)
+        for attendee, previous, margin in saved_busy:
+            self.busy[attendee] = previous
+            self._margin[attendee] = margin
+        self._held.update(saved_held)
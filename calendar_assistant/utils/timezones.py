@@ -0,0 +1,168 @@
+"""Timezone handling for calendar times.
+
+Event times are normalized to epoch seconds once, when events arrive from
+the API. Converting between epochs and a zone's local time then goes through
+cached ZoneInfo objects and per-year tables of UTC-offset transitions, so
+filtering and formatting never re-parse ISO strings or re-evaluate zone rules.
+"""
+
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+UTC = 'UTC'
+DAY = 86400
+
+# date.toordinal() of 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """Get a cached ZoneInfo for an IANA zone name."""
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=None)
+def is_valid_zone(name: str) -> bool:
+    """Check whether a name is a known IANA zone."""
+    try:
+        get_zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def _offset(zone: ZoneInfo, epoch: int) -> int:
+    return int(datetime.fromtimestamp(epoch, zone).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=1024)
+def _year_transitions(name: str, year: int) -> Tuple[List[int], List[int]]:
+    """UTC-offset transitions within a UTC year.
+
+    Returns:
+        Epochs at which a new offset takes effect (the first is the start of
+        the year) and the offset in seconds from each of them
+    """
+    zone = get_zone(name)
+    start = int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp())
+    end = int(datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+    epochs = [start]
+    offsets = [_offset(zone, start)]
+
+    # Probe daily, then bisect to the second where the offset changes
+    day = start
+    while day < end:
+        following = min(day + DAY, end)
+        if _offset(zone, following) != offsets[-1]:
+            low, high = day, following
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset(zone, middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            epochs.append(high)
+            offsets.append(_offset(zone, high))
+        day = following
+    return epochs, offsets
+
+
+def utc_offset(epoch: int, name: str) -> int:
+    """UTC offset in seconds of a zone at an instant."""
+    if name == UTC:
+        return 0
+    epochs, offsets = _year_transitions(name, time.gmtime(epoch).tm_year)
+    return offsets[bisect_right(epochs, epoch) - 1]
+
+
+def transitions(name: str, start: int, end: int) -> Tuple[List[int], List[int]]:
+    """Offset transition table covering ``[start, end]``, for vectorized lookups."""
+    if name == UTC:
+        return [start], [0]
+    epochs, offsets = [], []
+    for year in range(time.gmtime(start).tm_year, time.gmtime(end).tm_year + 1):
+        year_epochs, year_offsets = _year_transitions(name, year)
+        epochs.extend(year_epochs)
+        offsets.extend(year_offsets)
+    return epochs, offsets
+
+
+def to_epoch(value: Union[datetime, str, int], zone: str = UTC) -> int:
+    """Convert a datetime or RFC 3339 string to epoch seconds.
+
+    Args:
+        value: Aware or naive datetime, ISO string, or epoch seconds
+        zone: Zone in which naive values are local time
+
+    Returns:
+        Epoch seconds
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=get_zone(zone))
+    return int(value.timestamp())
+
+
+def from_epoch(epoch: int) -> str:
+    """Format epoch seconds as an RFC 3339 UTC string."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(epoch))
+
+
+def format_local(epoch: int, zone: str) -> str:
+    """Format epoch seconds as an ISO string in a zone's local time."""
+    offset = utc_offset(epoch, zone)
+    local = datetime.fromtimestamp(epoch + offset, timezone.utc)
+    return local.replace(tzinfo=timezone(timedelta(seconds=offset))).isoformat()
+
+
+def local_date(epoch: int, zone: str) -> date:
+    """Calendar date of an instant in a zone."""
+    return date.fromordinal(_EPOCH_ORDINAL + (epoch + utc_offset(epoch, zone)) // DAY)
+
+
+def day_start(day: date, zone: str) -> int:
+    """Epoch of local midnight starting a date in a zone."""
+    return to_epoch(datetime(day.year, day.month, day.day), zone)
+
+
+def day_bounds(epoch: int, zone: str, days: int = 1) -> Tuple[int, int]:
+    """Local-midnight bounds of the ``days`` days starting with the one containing ``epoch``."""
+    first = local_date(epoch, zone)
+    return day_start(first, zone), day_start(first + timedelta(days=days), zone)
+
+
+def event_span(event: Dict[str, Any], zone: str = UTC) -> Tuple[int, int]:
+    """Return an event's ``(start, end)`` in epoch seconds.
+
+    Uses the span recorded by ``normalize_event`` when present. All-day
+    events run from local midnight to local midnight in ``zone``.
+    """
+    span = event.get('_span')
+    if span is not None:
+        return span
+
+    bounds = []
+    for field in ('start', 'end'):
+        value = event.get(field, {})
+        if value.get('dateTime'):
+            bounds.append(to_epoch(value['dateTime'], value.get('timeZone') or zone))
+        elif value.get('date'):
+            bounds.append(day_start(date.fromisoformat(value['date']), zone))
+        else:
+            bounds.append(0)
+    return bounds[0], bounds[1]
+
+
+def normalize_event(event: Dict[str, Any], zone: str = UTC) -> Dict[str, Any]:
+    """Record an event's epoch span under ``_span`` so it is parsed only once."""
+    event.pop('_span', None)
+    event['_span'] = event_span(event, zone)
+    return event
@@ -0,0 +1,154 @@
+"""Pooled keep-alive HTTP transport for the Google API client.
+
+``googleapiclient`` talks to an httplib2-style ``http`` object. ``PooledHttp``
+implements that interface on top of a pooled session, so every API call made
+through one client (including batch requests and background threads) reuses
+warm TCP/TLS connections instead of a single unshareable httplib2 connection.
+"""
+
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401
+    import httpx
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+class _GoogleAuth(httpx.Auth if HAS_HTTP2 else object):
+    """Adds Google credentials to httpx requests, refreshing once on 401."""
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self._refresh_request = Request()
+        self._lock = threading.Lock()
+
+    def auth_flow(self, request):
+        with self._lock:
+            self.credentials.before_request(
+                self._refresh_request, request.method, str(request.url), request.headers
+            )
+        response = yield request
+        if response.status_code == 401:
+            with self._lock:
+                self.credentials.refresh(self._refresh_request)
+                self.credentials.apply(request.headers)
+            yield request
+
+
+class PooledHttp:
+    """httplib2-compatible front end over a shared, pooled HTTP session.
+
+    Safe to share across threads. Connections are kept alive and reused
+    per host, with at most ``pool_size`` requests to a host at a time.
+    """
+
+    def __init__(
+        self,
+        credentials=None,
+        pool_size: int = 10,
+        max_hosts: int = 4,
+        timeout: float = 30.0,
+        http2: bool = False
+    ):
+        """Initialize the transport.
+
+        Args:
+            credentials: google-auth credentials, or None for unauthenticated use
+            pool_size: Keep-alive connections (HTTP/1.1) or concurrent
+                requests (HTTP/2) per host
+            max_hosts: Hosts with their own connection pool
+            timeout: Seconds to wait for a connection or a response
+            http2: Use HTTP/2 when httpx and h2 are installed
+        """
+        self.credentials = credentials
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.requests_made = 0
+
+        if http2 and not HAS_HTTP2:
+            print('HTTP/2 requested but httpx[http2] is not installed; using HTTP/1.1',
+                  file=sys.stderr)
+        self.http2 = http2 and HAS_HTTP2
+
+        if self.http2:
+            # httpx only limits connections overall, so cap each host here
+            self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+            self._host_slots_lock = threading.Lock()
+            self._session = httpx.Client(
+                http2=True,
+                auth=_GoogleAuth(credentials) if credentials is not None else None,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=pool_size * max_hosts,
+                    max_keepalive_connections=pool_size * max_hosts
+                )
+            )
+        else:
+            if credentials is not None:
+                self._session = AuthorizedSession(credentials)
+            else:
+                self._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=max_hosts,
+                pool_maxsize=pool_size,
+                pool_block=True
+            )
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+
+    def request(
+        self,
+        uri: str,
+        method: str = 'GET',
+        body: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        redirections: int = 5,
+        connection_type: Any = None
+    ) -> Tuple[httplib2.Response, bytes]:
+        """Perform a request, returning ``(response, content)`` like httplib2."""
+        self.requests_made += 1
+        if self.http2:
+            with self._host_slot(uri):
+                response = self._session.request(
+                    method, uri, content=body, headers=headers,
+                    follow_redirects=redirections > 0
+                )
+            reason = response.reason_phrase
+        else:
+            response = self._session.request(
+                method, uri, data=body, headers=headers,
+                timeout=self.timeout, allow_redirects=redirections > 0
+            )
+            reason = response.reason
+
+        info = {key.lower(): value for key, value in response.headers.items()}
+        # Bodies come back decoded; mark them the way httplib2 does
+        if 'content-encoding' in info:
+            info['-content-encoding'] = info.pop('content-encoding')
+        info['status'] = str(response.status_code)
+        result = httplib2.Response(info)
+        result.reason = reason
+        return result, response.content
+
+    def _host_slot(self, uri: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent HTTP/2 requests to the URI's host."""
+        host = urlsplit(uri).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.pool_size)
+        return slot
+
+    def close(self):
+        """Close all pooled connections."""
+        self._session.close()
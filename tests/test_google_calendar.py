@@ -0,0 +1,117 @@
+"""Conflict checks in GoogleCalendarClient against a fake Calendar service."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('googleapiclient')
+
+from googleapiclient.errors import HttpError  # noqa: E402
+
+from calendar_assistant.utils.conflicts import ConflictCheckError, SchedulingConflictError  # noqa: E402
+from calendar_assistant.utils.google_calendar import GoogleCalendarClient  # noqa: E402
+
+
+class _Response(dict):
+    def __init__(self, status):
+        super().__init__(status=status)
+        self.status = status
+        self.reason = 'error'
+
+
+class _Request:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return self.run()
+
+
+class FakeService:
+    """Just enough of the Calendar API for creating and deleting events."""
+
+    def __init__(self, events):
+        self.stored = {event['id']: event for event in events}
+        self.calls = []
+        self.fail_freebusy = False
+
+    def freebusy(self):
+        return self
+
+    def events(self):
+        return self
+
+    def query(self, body):
+        self.calls.append('freebusy')
+
+        def run():
+            if self.fail_freebusy:
+                raise HttpError(_Response(500), b'backend error')
+            busy = [
+                {'start': event['start']['dateTime'], 'end': event['end']['dateTime']}
+                for event in self.stored.values()
+            ]
+            return {'calendars': {item['id']: {'busy': busy} for item in body['items']}}
+        return _Request(run)
+
+    def insert(self, calendarId, body):
+        self.calls.append('insert')
+        event = dict(body, id=f'new{len(self.stored)}')
+        self.stored[event['id']] = event
+        return _Request(lambda: dict(event))
+
+    def delete(self, calendarId, eventId):
+        self.calls.append('delete')
+        return _Request(lambda: self.stored.pop(eventId) and None)
+
+
+def _client(monkeypatch, events):
+    monkeypatch.setattr(GoogleCalendarClient, '_authenticate', lambda self: None)
+    client = GoogleCalendarClient(timezone='UTC')
+    client.service = FakeService(events)
+    return client
+
+
+def _event(event_id, start, end):
+    return {
+        'id': event_id,
+        'start': {'dateTime': start},
+        'end': {'dateTime': end},
+    }
+
+
+def test_deleted_event_no_longer_conflicts(monkeypatch):
+    client = _client(monkeypatch, [_event('x', '2024-01-01T10:00:00Z', '2024-01-01T11:00:00Z')])
+    start, end = datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11)
+
+    # Free/busy indexes the event's time without its ID
+    assert client.find_conflicts(start, end)
+    assert client.delete_event('x')
+
+    event = client.create_event('Moved in', start, end, conflict_policy='reject')
+
+    assert event['id']
+    assert client.service.calls == ['freebusy', 'delete', 'freebusy', 'insert']
+
+
+def test_reject_does_not_write_when_busy_time_is_unreadable(monkeypatch):
+    client = _client(monkeypatch, [])
+    client.service.fail_freebusy = True
+
+    with pytest.raises(ConflictCheckError):
+        client.create_event(
+            'Unchecked', datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11),
+            conflict_policy='reject'
+        )
+    assert client.service.calls == ['freebusy']
+
+
+def test_reject_still_blocks_real_overlaps(monkeypatch):
+    client = _client(monkeypatch, [_event('x', '2024-01-01T10:00:00Z', '2024-01-01T11:00:00Z')])
+
+    with pytest.raises(SchedulingConflictError):
+        client.create_event(
+            'Clash', datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 11, 30),
+            conflict_policy='reject'
+        )
+    assert 'insert' not in client.service.calls
@@ -0,0 +1,86 @@
+"""Round trips through the .ics writer and reader."""
+
+import io
+
+from calendar_assistant.utils import ics
+
+
+def _round_trip(events):
+    fh = io.StringIO()
+    ics.write_calendar(fh, events)
+    fh.seek(0)
+    return [
+        (ics.vevent_to_event(properties), ics.recurrence_exclusion(properties))
+        for properties in ics.iter_vevents(fh)
+    ]
+
+
+def test_exported_instances_keep_distinct_ids():
+    instances = [
+        {
+            'id': f'ser_2024010{day}T090000Z',
+            'iCalUID': 'ser@google.com',
+            'recurringEventId': 'ser',
+            'summary': 'Standup',
+            'start': {'dateTime': f'2024-01-0{day}T09:00:00Z'},
+            'end': {'dateTime': f'2024-01-0{day}T09:15:00Z'},
+            'originalStartTime': {'dateTime': f'2024-01-0{day}T09:00:00Z'},
+        }
+        for day in (1, 2)
+    ]
+
+    imported = _round_trip(instances)
+
+    ids = [event['id'] for event, _ in imported]
+    assert len(set(ids)) == 2
+    assert ids[0] != ics.event_key('ser@google.com')
+    assert [event['start'] for event, _ in imported] == [
+        {'dateTime': '2024-01-01T09:00:00Z'},
+        {'dateTime': '2024-01-02T09:00:00Z'},
+    ]
+    assert imported[1][1] == ('ser@google.com', 'EXDATE:20240102T090000Z')
+
+
+def test_exported_all_day_instance_uses_date_recurrence_id():
+    instance = {
+        'id': 'hol_20240105',
+        'iCalUID': 'hol@google.com',
+        'recurringEventId': 'hol',
+        'start': {'date': '2024-01-05'},
+        'end': {'date': '2024-01-06'},
+        'originalStartTime': {'date': '2024-01-05'},
+    }
+
+    [(event, exclusion)] = _round_trip([instance])
+
+    assert event['id'] == ics.event_key('hol@google.com', '20240105')
+    assert exclusion == ('hol@google.com', 'EXDATE;VALUE=DATE:20240105')
+
+
+def test_single_event_round_trip_is_unchanged():
+    single = {
+        'id': 'abc',
+        'iCalUID': 'abc@google.com',
+        'summary': 'Lunch, then review',
+        'start': {'dateTime': '2024-01-01T12:00:00Z'},
+        'end': {'dateTime': '2024-01-01T13:00:00Z'},
+    }
+
+    [(event, exclusion)] = _round_trip([single])
+
+    assert event['id'] == ics.event_key('abc@google.com')
+    assert event['summary'] == 'Lunch, then review'
+    assert exclusion is None
+
+
+def test_iso_formatted_dates_are_accepted():
+    properties = [
+        ('UID', {}, 'iso'),
+        ('DTSTART', {}, '2024-01-05'),
+        ('DTEND', {}, '2024-01-05T09:30:00Z'),
+    ]
+
+    event = ics.vevent_to_event(properties)
+
+    assert event['start'] == {'date': '2024-01-05'}
+    assert event['end'] == {'dateTime': '2024-01-05T09:30:00Z'}
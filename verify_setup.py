@@ -38,7 +38,8 @@ def check_python_packages():
         'ollama',
         'langchain',
         'click',
-        'rich'
+        'rich',
+        'numpy'
     ]
 
     all_good = True